@@ -1,5 +1,8 @@
 from collections import deque
-nodes_examined = 0
+
+from game_state import AlphaBetaSearch, GraphNodeState
+from search_statistics import SearchStatistics
+from tree_parser import iter_graphs
 
 
 class GraphNode:
@@ -71,7 +74,8 @@ def create_graph(nodes, edges):
 
     # construct graph
     for n1, n2 in edges:
-        if n2.isalpha():
+        # a child that is not the name of a node is the value of a leaf, names can have digits
+        if n2 in graphnodes:
             # add n2 as a child of n1
             graphnodes[n1].add_child(graphnodes[n2])
         else:
@@ -99,44 +103,30 @@ def print_tree(tree):
                     queue.append(child)
 
 
-def alpha_beta(current_node, alpha, beta):
-    global nodes_examined
-    if type(current_node) == int:
-        nodes_examined += 1
-        return current_node
-    elif current_node.type == "MAX":
-        for child in current_node.children:
-            alpha = max(alpha, alpha_beta(child, alpha, beta))
-            if alpha >= beta:
-                break
-        return alpha
-    elif current_node.type == "MIN":
-        for child in current_node.children:
-            beta = min(beta, alpha_beta(child, alpha, beta))
-            if beta <= alpha:
-                break
-        return beta
-    else:
-        print('Error 01: an unexpected error has occurred.')
+# searches any GameState with game_state.AlphaBetaSearch, which generates the successors of a position one at a time
+# and evaluates the positions max_depth moves from the root, or searches to the end of the game if it is None.
+# A tree from create_graph is searched through GraphNodeState(graph). stats is a SearchStatistics that counts the
+# leaves, nodes and cutoffs, or None
+def alpha_beta(state, alpha, beta, stats=None, max_depth=None):
+    return AlphaBetaSearch(max_depth, stats=stats).search(state, alpha, beta)
 
 
 def main():
-    global nodes_examined
     # NAME OF INPUT FILE HERE
     input_file_name = 'alphabeta.txt'
-    input_data_in_string = read_input(input_file_name)
     output_file = open('alphabeta_out.txt', 'w')
-    # print(input_data_in_string)
-    i = 0
-    while i < len(input_data_in_string):
-        nodes_examined = 0
-        # Every two lists in input_data_in_string consists of: list of nodes, list of edges
-        graph = create_graph(input_data_in_string[i], input_data_in_string[i+1])
+    # the graphs are read one at a time, as a list of nodes and a list of edges
+    for i, (nodes, edges) in enumerate(iter_graphs(input_file_name)):
+        stats = SearchStatistics()
+        graph = create_graph(nodes, edges)
         # print_tree(graph)
-        score = alpha_beta(graph, float('-inf'), float('inf'))
-        # print(score, nodes_examined)
-        output_file.write('Graph {}: Score: {}; Leaf Nodes Examined: {} \n'.format(i // 2 + 1, score, nodes_examined))
-        i += 2
+        stats.start()
+        score = alpha_beta(GraphNodeState(graph), float('-inf'), float('inf'), stats)
+        stats.stop()
+        # print(score, stats.record())
+        output_file.write('Graph {}: Score: {}; Leaf Nodes Examined: {} \n'.format(i + 1, score,
+                                                                                   stats.leaves_examined))
 
 
-main()
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+import random
+
+
+def node_name(number):
+    # create_graph takes a child for a node if it is the name of one (n2 in graphnodes) and for a leaf value
+    # otherwise, so the names A to Z, AA, AB, ... are letters to never equal a leaf value
+    name = ''
+    number += 1
+    while number:
+        number, letter = divmod(number - 1, 26)
+        name = chr(ord('A') + letter) + name
+    return name
+
+
+def create_tree(branching, depth, low=-100, high=100, step=None):
+    """
+    Creates a uniform game tree with a MAX root, levels alternating between MAX and MIN, and random leaf values.
+    :param branching: the number of children of every inner node
+    :param depth: the number of moves from the root to every leaf
+    :param low: the smallest leaf value
+    :param high: the largest leaf value
+    :param step: if given, the leaf values are not independent but a random walk from the root, every move adding
+                 a random number between -step and step, so that like in a real game the leaves below a node are
+                 close to each other and the value of one predicts the others
+    :return: a pair (nodes, edges) of lists in the format of alphabeta.read_input
+    """
+    nodes = [(node_name(0), 'MAX')]
+    edges = []
+    level = [node_name(0)]
+    walk = [random.randint(low, high) if step is not None else 0]  # the random walk at every node of the level
+    for d in range(1, depth):
+        node_type = 'MAX' if d % 2 == 0 else 'MIN'
+        next_level = []
+        next_walk = []
+        for parent, value in zip(level, walk):
+            for _ in range(branching):
+                child = node_name(len(nodes))
+                nodes.append((child, node_type))
+                edges.append((parent, child))
+                next_level.append(child)
+                if step is not None:
+                    next_walk.append(value + random.randint(-step, step))
+        level = next_level
+        walk = next_walk or [0] * len(level)
+    for parent, value in zip(level, walk):
+        for _ in range(branching):
+            if step is None:
+                edges.append((parent, str(random.randint(low, high))))
+            else:
+                edges.append((parent, str(max(low, min(high, value + random.randint(-step, step))))))
+    return nodes, edges
+
+
+def order_tree(nodes, edges, best_first=True):
+    """
+    Orders the children of every node by their minimax values, so that alpha-beta search meets its best case, where
+    it examines only the minimal tree, or its worst case, where it prunes nothing.
+    :param nodes: a list of (name, type), parents before their children, as made by create_tree
+    :param edges: a list of (parent name, child), where child is the name of a node or the value of a leaf
+    :param best_first: True to put the best move of every node first, False to put it last
+    :return: the edges, grouped by parent in the order of the nodes
+    """
+    children = {name: [] for name, _ in nodes}
+    for parent, child in edges:
+        children[parent].append(child)
+    values = dict()
+    # the children of a node come after it, so the nodes are valued from the last one
+    for name, node_type in reversed(nodes):
+        child_values = [values[child] if child in children else int(child) for child in children[name]]
+        ordered = sorted(zip(child_values, children[name]), key=lambda pair: pair[0],
+                         reverse=(node_type == 'MAX') == best_first)
+        children[name] = [child for _, child in ordered]
+        values[name] = max(child_values) if node_type == 'MAX' else min(child_values)
+    return [(name, child) for name, _ in nodes for child in children[name]]
+
+
+def write_tree(nodes, edges, file):
+    file.write('{' + ','.join('({},{})'.format(name, node_type) for name, node_type in nodes) + '} ')
+    file.write('{' + ','.join('({},{})'.format(parent, child) for parent, child in edges) + '}\n')
+
+
+def write_new_tree_to_input_file(branching, depth):
+    input_file_name = 'alphabeta.txt'
+    nodes, edges = create_tree(branching, depth)
+    with open(input_file_name, 'a') as file:
+        file.write('\n')
+        write_tree(nodes, edges, file)
+
+
+def main():
+    # write a new tree into the input file to be run by alphabeta.py.
+    branching = 3
+    depth = 4
+    write_new_tree_to_input_file(branching, depth)
+
+
+if __name__ == '__main__':
+    main()
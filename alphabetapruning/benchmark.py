@@ -0,0 +1,183 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+from alphabeta import alpha_beta, create_graph
+from alphabeta_test import create_tree, order_tree
+from game_state import GraphNodeState
+from search_statistics import SearchStatistics
+
+# a map from a distribution of leaf values to the low and high values and the step of create_tree
+DISTRIBUTIONS = {'uniform': (-100, 100, None),
+                 'random_walk': (-1000, 1000, 20),
+                 'few_values': (-2, 2, None)}
+# random keeps the order of create_tree, best puts the best move of every node first and worst puts it last
+ORDERINGS = ('random', 'best', 'worst')
+
+DEFAULT_WIDTHS = (2, 3, 4, 8)
+DEFAULT_DEPTHS = (4, 6, 8)
+DEFAULT_MAX_LEAVES = 300000
+DEFAULT_SEED = 2019
+
+
+def generate_tree(width, depth, distribution, ordering, seed):
+    """
+    Creates the same game tree for the same arguments on every run and every machine. The orderings of a tree
+    have the same leaf values, so they can be compared with each other.
+    :param width: the number of children of every inner node
+    :param depth: the number of moves from the root to every leaf
+    :param distribution: a key of DISTRIBUTIONS
+    :param ordering: one of ORDERINGS
+    :param seed: the seed of the benchmark
+    :return: a pair (nodes, edges) of lists in the format of alphabeta.read_input
+    """
+    # a string seed is hashed with SHA-512 by random.seed, so it does not depend on PYTHONHASHSEED
+    random.seed('{}:{}^{}:{}'.format(seed, width, depth, distribution))
+    low, high, step = DISTRIBUTIONS[distribution]
+    nodes, edges = create_tree(width, depth, low, high, step)
+    if ordering != 'random':
+        edges = order_tree(nodes, edges, ordering == 'best')
+    return nodes, edges
+
+
+def minimal_leaves(width, depth):
+    """
+    :return: the number of leaves of the minimal tree of a uniform tree, the leaves that alpha-beta search examines
+             when the best move of every node comes first, and that any search must examine to prove the score when
+             the leaf values are distinct (Knuth and Moore)
+    """
+    return width ** ((depth + 1) // 2) + width ** (depth // 2) - 1
+
+
+def measure(graph, repeat=3):
+    """
+    Runs one search of the benchmark and measures it.
+    The wall time is the smallest of repeat runs without statistics, which slow the search down. The counters come
+    from one more run with a SearchStatistics.
+    :param graph: the root GraphNode of the tree
+    :param repeat: the number of timed runs
+    :return: a dictionary of the measurements
+    """
+    state = GraphNodeState(graph)
+    wall_time = float('inf')
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        score = alpha_beta(state, float('-inf'), float('inf'))
+        wall_time = min(wall_time, time.perf_counter() - start_time)
+    stats = SearchStatistics()
+    stats.start()
+    alpha_beta(state, float('-inf'), float('inf'), stats)
+    stats.stop()
+    result = {'score': score, 'wall_time': wall_time}
+    result.update(stats.record())
+    return result
+
+
+def run_benchmark(widths, depths, distributions, orderings, seed, repeat=3, max_leaves=DEFAULT_MAX_LEAVES):
+    """
+    Searches one seeded tree per width, depth, distribution of leaf values and ordering.
+    :param widths: a list of numbers of children of every inner node
+    :param depths: a list of depths
+    :param distributions: a list of keys of DISTRIBUTIONS
+    :param orderings: a list of ORDERINGS
+    :param seed: the seed the trees are generated from
+    :param repeat: the number of timed runs of every search
+    :param max_leaves: the trees with more leaves than this are skipped
+    :return: a list of results, one dictionary per run
+    """
+    results = []
+    for width in widths:
+        for depth in depths:
+            if width ** depth > max_leaves:
+                continue
+            for distribution in distributions:
+                for ordering in orderings:
+                    graph = create_graph(*generate_tree(width, depth, distribution, ordering, seed))
+                    result = {'width': width, 'depth': depth, 'distribution': distribution, 'ordering': ordering,
+                              'seed': seed, 'leaves': width ** depth, 'minimal_leaves': minimal_leaves(width, depth)}
+                    result.update(measure(graph, repeat))
+                    result['pruning_efficiency'] = result['minimal_leaves'] / result['leaves_examined']
+                    print('{}^{} {} {}: {:.4f}s, {} of {} leaves examined, minimal tree {}, '
+                          'effective branching factor {:.2f}'.format(
+                              width, depth, distribution, ordering, result['wall_time'], result['leaves_examined'],
+                              result['leaves'], result['minimal_leaves'], result['effective_branching_factor']))
+                    results.append(result)
+    return results
+
+
+def check_pruning(results):
+    """
+    Finds the runs that prune less than they should: with the best move first, alpha-beta search examines the
+    minimal tree, or fewer leaves when leaf values are equal and close windows early.
+    :param results: a list of results of run_benchmark
+    :return: a list of strings, one per problem
+    """
+    problems = []
+    for result in results:
+        if result['ordering'] == 'best' and result['leaves_examined'] > result['minimal_leaves']:
+            problems.append('{}^{} {} seed={}: {} leaves examined with the best ordering, the minimal tree has '
+                            '{}'.format(result['width'], result['depth'], result['distribution'], result['seed'],
+                                        result['leaves_examined'], result['minimal_leaves']))
+    return problems
+
+
+def print_pruning_summary(results):
+    """
+    Prints the leaves examined against the minimal tree for every ordering, one line per tree.
+    :param results: a list of results of run_benchmark
+    """
+    rows = dict()
+    for result in results:
+        key = (result['width'], result['depth'], result['distribution'])
+        rows.setdefault(key, []).append(result)
+    print()
+    print('Leaves examined, as a multiple of the minimal tree:')
+    for (width, depth, distribution), row in sorted(rows.items()):
+        print('    {}^{} {}: {}'.format(width, depth, distribution, ', '.join(
+            '{}: {:.2f}'.format(result['ordering'], result['leaves_examined'] / result['minimal_leaves'])
+            for result in row)))
+
+
+def write_results(results, file_name):
+    """
+    Writes the results of a benchmark to a JSON file together with the Python version they were measured with.
+    :param results: a list of results of run_benchmark
+    :param file_name: the output file name
+    """
+    with open(file_name, 'w') as file:
+        json.dump({'python': platform.python_version(),
+                   'machine': platform.machine(),
+                   'results': results}, file, indent=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark alpha-beta search on seeded game trees.')
+    parser.add_argument('--widths', nargs='+', type=int, default=DEFAULT_WIDTHS)
+    parser.add_argument('--depths', nargs='+', type=int, default=DEFAULT_DEPTHS)
+    parser.add_argument('--distributions', nargs='+', choices=sorted(DISTRIBUTIONS), default=sorted(DISTRIBUTIONS))
+    parser.add_argument('--orderings', nargs='+', choices=ORDERINGS, default=ORDERINGS)
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--repeat', type=int, default=3, help='the number of timed runs of every search')
+    parser.add_argument('--max-leaves', type=int, default=DEFAULT_MAX_LEAVES,
+                        help='skip the trees with more leaves than this')
+    parser.add_argument('--output', default='benchmark_results.json')
+    arguments = parser.parse_args()
+
+    results = run_benchmark(arguments.widths, arguments.depths, arguments.distributions, arguments.orderings,
+                            arguments.seed, arguments.repeat, arguments.max_leaves)
+    print_pruning_summary(results)
+    write_results(results, arguments.output)
+    print('Results written to', arguments.output)
+    problems = check_pruning(results)
+    for problem in problems:
+        print(problem)
+    print(len(problems), 'pruning problems found')
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
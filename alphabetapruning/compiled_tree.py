@@ -0,0 +1,190 @@
+from array import array
+import mmap
+import os
+import random
+import shutil
+import struct
+import sys
+import tempfile
+import time
+
+from alphabeta_test import create_tree, write_tree
+from game_tree import ArrayGameTree
+from tree_parser import iter_graphs
+
+# A compiled tree file holds any number of game trees in the arrays of ArrayGameTree:
+#   file header: magic, version, number of trees, offset of the tree table
+#   tree records, each a tree header followed by the arrays node_types (1 byte per inner node), child_offsets and
+#   children (4 bytes per entry) and leaf_values (8 bytes per leaf), little-endian, each followed by zero bytes up to
+#   a multiple of 8
+#   tree table: the offset of every tree record
+MAGIC = b'ABGT'
+VERSION = 1
+FILE_HEADER = struct.Struct('<4sHxxIxxxxQ')  # magic, version, number of trees, offset of the tree table
+TREE_HEADER = struct.Struct('<QQQ')  # inner nodes, children, leaves
+OFFSET = struct.Struct('<Q')
+
+
+def write_array(values, file):
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    values.tofile(file)
+    file.write(bytes(-file.tell() % 8))
+
+
+def write_compiled_tree(tree, file):
+    """
+    Writes a tree record at the current position of a file, which must be a multiple of 8.
+    :param tree: an ArrayGameTree
+    :param file: a file opened for writing in binary mode
+    """
+    file.write(TREE_HEADER.pack(len(tree.node_types), len(tree.children), len(tree.leaf_values)))
+    file.write(tree.node_types)
+    file.write(bytes(-file.tell() % 8))
+    write_array(array('i', tree.child_offsets), file)
+    write_array(array('i', tree.children), file)
+    write_array(array('q', tree.leaf_values), file)
+
+
+def compile_tree_file(text_file_name, binary_file_name):
+    """
+    Compiles a text file of game trees, as read by tree_parser.iter_graphs, to a compiled tree file.
+    The trees are compiled one at a time.
+    :param text_file_name: the input text file name
+    :param binary_file_name: the output binary file name
+    :return: the number of trees compiled
+    """
+    return write_compiled_tree_file((ArrayGameTree.from_nodes_edges(nodes, edges)
+                                     for nodes, edges in iter_graphs(text_file_name)), binary_file_name)
+
+
+def write_compiled_tree_file(trees, binary_file_name):
+    """
+    Writes game trees to a compiled tree file.
+    :param trees: an iterable of ArrayGameTrees, which is read one tree at a time
+    :param binary_file_name: the output binary file name
+    :return: the number of trees written
+    """
+    offsets = []
+    with open(binary_file_name, 'wb') as file:
+        file.write(bytes(FILE_HEADER.size))
+        for tree in trees:
+            offsets.append(file.tell())
+            write_compiled_tree(tree, file)
+        table_offset = file.tell()
+        for offset in offsets:
+            file.write(OFFSET.pack(offset))
+        file.seek(0)
+        file.write(FILE_HEADER.pack(MAGIC, VERSION, len(offsets), table_offset))
+    return len(offsets)
+
+
+class CompiledTreeFile:
+    """
+    A compiled tree file mapped into memory. The arrays of a tree are views of the mapping, so opening a tree takes
+    the same time whatever its size, no Python object is made per node, and processes that open the same file share
+    its pages.
+    """
+
+    def __init__(self, file_name):
+        with open(file_name, 'rb') as file:
+            self.mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.buffer = memoryview(self.mapping)
+        if len(self.buffer) < FILE_HEADER.size:
+            raise ValueError('{} is too short to be a compiled tree file'.format(file_name))
+        magic, version, self.num_trees, self.table_offset = FILE_HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC:
+            raise ValueError('{} is not a compiled tree file'.format(file_name))
+        if version != VERSION:
+            raise ValueError('{} has version {}, expected {}'.format(file_name, version, VERSION))
+
+    def __len__(self):
+        return self.num_trees
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Closes the file. The trees from get_tree are views of the mapping, so while one of them is still in use the
+        mapping stays open for it, and it is unmapped when the last one is dropped.
+        """
+        if self.mapping is None:
+            return
+        self.buffer.release()
+        try:
+            self.mapping.close()
+        except BufferError:
+            pass
+        self.mapping = None
+
+    def get_array(self, offset, typecode, length):
+        """
+        :return: a pair (the array at offset in the file, the offset after it and its padding)
+        """
+        size = length * array(typecode).itemsize
+        view = self.buffer[offset:offset + size].cast(typecode)
+        if sys.byteorder == 'big' and typecode != 'B':
+            # the file is little-endian, so the array is copied to be read in the order of this machine
+            view = array(typecode, view)
+            view.byteswap()
+        return view, offset + size + (-size % 8)
+
+    def get_tree(self, index=0):
+        """
+        :param index: the position of the tree in the file
+        :return: an ArrayGameTree whose arrays are views of the mapped file
+        """
+        if not 0 <= index < self.num_trees:
+            raise IndexError('tree {} is not in the file, which has {} trees'.format(index, self.num_trees))
+        offset = OFFSET.unpack_from(self.buffer, self.table_offset + index * OFFSET.size)[0]
+        num_nodes, num_children, num_leaves = TREE_HEADER.unpack_from(self.buffer, offset)
+        offset += TREE_HEADER.size
+        node_types, offset = self.get_array(offset, 'B', num_nodes)
+        child_offsets, offset = self.get_array(offset, 'i', num_nodes + 1)
+        children, offset = self.get_array(offset, 'i', num_children)
+        leaf_values, offset = self.get_array(offset, 'q', num_leaves)
+        return ArrayGameTree(node_types, child_offsets, children, leaf_values)
+
+
+def main():
+    # NAME OF INPUT FILE HERE
+    input_file_name = 'alphabeta.txt'
+    compiled_file_name = 'alphabeta.abt'
+    num_trees = compile_tree_file(input_file_name, compiled_file_name)
+    print('Compiled', num_trees, 'trees from', input_file_name, 'to', compiled_file_name)
+    with CompiledTreeFile(compiled_file_name) as compiled:
+        for i in range(len(compiled)):
+            score, nodes_examined = compiled.get_tree(i).alpha_beta()
+            print('Graph {}: Score: {}; Leaf Nodes Examined: {} '.format(i + 1, score, nodes_examined))
+
+    # the time to get a large tree ready to search, from its text and from its compiled file
+    random.seed(0)
+    directory = tempfile.mkdtemp()
+    text_file_name = os.path.join(directory, 'alphabeta_large.txt')
+    compiled_file_name = os.path.join(directory, 'alphabeta_large.abt')
+    with open(text_file_name, 'w') as file:
+        write_tree(*create_tree(8, 6), file)
+    start_time = time.perf_counter()
+    nodes, edges = next(iter_graphs(text_file_name))
+    tree = ArrayGameTree.from_nodes_edges(nodes, edges)
+    text_time = time.perf_counter() - start_time
+    compile_tree_file(text_file_name, compiled_file_name)
+    start_time = time.perf_counter()
+    with CompiledTreeFile(compiled_file_name) as compiled:
+        compiled_tree = compiled.get_tree()
+        compiled_time = time.perf_counter() - start_time
+        if compiled_tree.alpha_beta() != tree.alpha_beta():
+            raise AssertionError('the compiled tree has another score')
+        del compiled_tree
+    print('A tree of {} nodes and {} leaves is ready to search in {:.3f}s from its text and in {:.6f}s from its '
+          'compiled file'.format(len(tree), len(tree.leaf_values), text_time, compiled_time))
+    shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+from abc import ABC, abstractmethod
+
+
+class GameState(ABC):
+    """
+    The interface of a position of a two player game searched by alphabeta.alpha_beta and AlphaBetaSearch.
+    Positions are created lazily: a search asks for the successors of a position only when it visits it, one at a
+    time, so successors after a cutoff are never created.
+    """
+
+    @abstractmethod
+    def successors(self):
+        """
+        :return: an iterable, preferably a generator, of the positions reachable in one move, best moves first
+        """
+
+    @abstractmethod
+    def is_terminal(self):
+        """
+        :return: True if the game is over in this position
+        """
+
+    @abstractmethod
+    def evaluate(self):
+        """
+        :return: the value of the position for the MAX player, exact for a terminal position and a heuristic
+                 estimate otherwise
+        """
+
+    @abstractmethod
+    def is_max_to_move(self):
+        """
+        :return: True if the MAX player moves in this position, False if the MIN player does
+        """
+
+    @abstractmethod
+    def key(self):
+        """
+        :return: a hashable key that is equal for equal positions, used by a transposition table
+        """
+
+
+class GraphNodeState(GameState):
+    """
+    A GameState over a tree built by alphabeta.create_graph, where a node is a GraphNode or an int leaf.
+    """
+
+    def __init__(self, node):
+        self.node = node
+
+    def successors(self):
+        for child in self.node.children:
+            yield GraphNodeState(child)
+
+    def is_terminal(self):
+        return type(self.node) == int
+
+    def evaluate(self):
+        if type(self.node) != int:
+            raise ValueError('node {} is not a leaf; trees from create_graph only have values at their leaves, '
+                             'so they must be searched without a depth limit'.format(self.node.name))
+        return self.node
+
+    def is_max_to_move(self):
+        if self.node.type not in ('MAX', 'MIN'):
+            raise ValueError('node {} has type {}, expected MAX or MIN'.format(self.node.name, self.node.type))
+        return self.node.type == 'MAX'
+
+    def key(self):
+        # create_graph makes one GraphNode per name, so a node with several parents has one name
+        return self.node.name
+
+
+class AlphaBetaSearch:
+    """
+    Fail-hard alpha-beta search of a GameState with an optional depth limit and transposition table.
+    Positions at the depth limit are evaluated like terminal positions. The search keeps one successor generator per
+    position on the path from the root on an explicit stack, so it is not limited by the recursion limit.
+    """
+
+    def __init__(self, max_depth=None, table=None, stats=None):
+        """
+        :param max_depth: the number of moves to search ahead, or None to search to the end of the game
+        :param table: a TranspositionTable for the results of inner positions, or None
+        :param stats: a SearchStatistics that counts the leaves, nodes and cutoffs of every search, or None
+        """
+        self.max_depth = max_depth
+        self.table = table
+        self.stats = stats
+        self.leaves_examined = 0  # positions evaluated by the last search
+        self.nodes_visited = 0  # positions created by the last search
+
+    def search(self, state, alpha=float('-inf'), beta=float('inf')):
+        """
+        alphabeta.alpha_beta is this search without a table. On a tree of GraphNodeStates it visits the leaves in the
+        order of the input, as the original recursive alpha_beta did, and returns the same score.
+        :param state: the GameState at the root
+        :param alpha: the lower bound of the window
+        :param beta: the upper bound of the window
+        :return: the score of the root
+        """
+        self.leaves_examined = 0
+        self.nodes_visited = 1
+        # one frame per position on the path from the root:
+        # [is MAX to move, successors, alpha, beta, the window it was entered with, key, remaining depth, state]
+        stack = []
+        value = self.enter(state, 0, alpha, beta, stack)
+        if not stack:
+            return value
+        while True:
+            frame = stack[-1]
+            is_max, successors, alpha, beta = frame[:4]
+            child = next(successors, None) if alpha < beta else None
+            if child is not None:
+                self.nodes_visited += 1
+                value = self.enter(child, len(stack), alpha, beta, stack)
+                if frame is not stack[-1]:
+                    continue
+            else:
+                # every successor has been searched or there was a cutoff, so the position is done
+                value = alpha if is_max else beta
+                stack.pop()
+                if self.stats is not None and alpha >= beta:
+                    self.stats.cutoff(frame[7], len(stack))
+                if self.table is not None:
+                    self.table.store(frame[5], value, frame[6], frame[4][0], frame[4][1])
+                if not stack:
+                    return value
+                frame = stack[-1]
+            if frame[0]:
+                if value > frame[2]:
+                    frame[2] = value
+            elif value < frame[3]:
+                frame[3] = value
+
+    def enter(self, state, depth, alpha, beta, stack):
+        """
+        Starts the search of a position: evaluates it if it is a leaf, looks it up in the table, or else pushes its
+        frame on the stack.
+        :return: the score of the position, or None if its frame was pushed
+        """
+        if state.is_terminal() or (self.max_depth is not None and depth >= self.max_depth):
+            self.leaves_examined += 1
+            value = state.evaluate()
+            if self.stats is not None:
+                self.stats.leaf(value, depth)
+            return value
+        remaining = self.max_depth - depth if self.max_depth is not None else float('inf')
+        key = None
+        if self.table is not None:
+            key = state.key()
+            value = self.table.probe(key, remaining, alpha, beta)
+            if value is not None:
+                return value
+        if self.stats is not None:
+            self.stats.node(state, depth)
+        stack.append([state.is_max_to_move(), iter(state.successors()), alpha, beta, (alpha, beta), key, remaining,
+                      state])
+        return None
+
+
+def main():
+    # imported here because alphabeta imports this module
+    from alphabeta import create_graph, read_input
+
+    # NAME OF INPUT FILE HERE
+    input_file_name = 'alphabeta.txt'
+    input_data_in_string = read_input(input_file_name)
+    search = AlphaBetaSearch()
+    i = 0
+    while i < len(input_data_in_string):
+        graph = create_graph(input_data_in_string[i], input_data_in_string[i + 1])
+        score = search.search(GraphNodeState(graph))
+        print('Graph {}: Score: {}; Leaf Nodes Examined: {} '.format(i // 2 + 1, score, search.leaves_examined))
+        i += 2
+
+
+if __name__ == '__main__':
+    main()
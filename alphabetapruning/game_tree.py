@@ -0,0 +1,184 @@
+from array import array
+
+from alphabeta import GraphNode, read_input
+
+MAX = 0
+MIN = 1
+NODE_TYPES = {'MAX': MAX, 'MIN': MIN}
+
+
+class ArrayGameTree:
+    """
+    A game tree stored in flat arrays instead of one GraphNode per node.
+    The inner nodes are numbered from 0, the root being 0, and the leaves are numbered separately:
+        node_types[i] is MAX or MIN for inner node i
+        the children of inner node i are children[child_offsets[i]:child_offsets[i + 1]], in order
+        a child c >= 0 is inner node c, and a child c < 0 is leaf -c - 1
+        leaf_values[j] is the value of leaf j
+    """
+
+    def __init__(self, node_types, child_offsets, children, leaf_values):
+        self.node_types = node_types
+        self.child_offsets = child_offsets
+        self.children = children
+        self.leaf_values = leaf_values
+
+    @classmethod
+    def from_nodes_edges(cls, nodes, edges):
+        """
+        Builds the tree straight from the lists read by alphabeta.read_input, without creating GraphNodes.
+        :param nodes: a list of (name, type) where type is 'MAX' or 'MIN', the root first
+        :param edges: a list of (parent name, child) where child is the name of a node or the value of a leaf
+        :return: the ArrayGameTree
+        """
+        numbers = dict()
+        node_types = bytearray()
+        for name, node_type in nodes:
+            if node_type not in NODE_TYPES:
+                raise ValueError('node {} has type {}, expected MAX or MIN'.format(name, node_type))
+            numbers[name] = len(node_types)
+            node_types.append(NODE_TYPES[node_type])
+        # group the children by parent, keeping the order of the edges
+        node_children = [[] for _ in range(len(node_types))]
+        leaf_values = array('q')
+        for parent, child in edges:
+            if child in numbers:
+                node_children[numbers[parent]].append(numbers[child])
+            else:
+                leaf_values.append(int(child))
+                node_children[numbers[parent]].append(-len(leaf_values))
+        return cls.from_child_lists(node_types, node_children, leaf_values)
+
+    @classmethod
+    def from_graph(cls, root):
+        """
+        Converts a tree of GraphNodes, as built by alphabeta.create_graph, numbering the nodes breadth first.
+        :param root: the root GraphNode
+        :return: the ArrayGameTree
+        """
+        numbers = {id(root): 0}
+        graph_nodes = [root]
+        node_children = []
+        leaf_values = array('q')
+        for graph_node in graph_nodes:  # graph_nodes grows while it is read
+            if graph_node.type not in NODE_TYPES:
+                raise ValueError('node {} has type {}, expected MAX or MIN'.format(graph_node.name, graph_node.type))
+            child_numbers = []
+            for child in graph_node.children:
+                if isinstance(child, GraphNode):
+                    if id(child) not in numbers:
+                        numbers[id(child)] = len(graph_nodes)
+                        graph_nodes.append(child)
+                    child_numbers.append(numbers[id(child)])
+                else:
+                    leaf_values.append(child)
+                    child_numbers.append(-len(leaf_values))
+            node_children.append(child_numbers)
+        node_types = bytearray(NODE_TYPES[graph_node.type] for graph_node in graph_nodes)
+        return cls.from_child_lists(node_types, node_children, leaf_values)
+
+    @classmethod
+    def from_child_lists(cls, node_types, node_children, leaf_values):
+        """
+        :param node_types: a bytearray of MAX or MIN per inner node
+        :param node_children: a list with the list of children of every inner node, encoded as in the class
+        :param leaf_values: an array of the values of the leaves
+        :return: the ArrayGameTree
+        """
+        child_offsets = array('i', [0])
+        children = array('i')
+        for child_numbers in node_children:
+            children.extend(child_numbers)
+            child_offsets.append(len(children))
+        return cls(node_types, child_offsets, children, leaf_values)
+
+    def __len__(self):
+        return len(self.node_types)
+
+    def alpha_beta(self, alpha=float('-inf'), beta=float('inf'), root=0, shared_alpha=None, shared_beta=None):
+        """
+        Fail-hard alpha-beta search from the root with an explicit stack instead of recursion, so the depth of the
+        tree is not limited by the recursion limit. It visits the same leaves in the same order as
+        alphabeta.alpha_beta and returns the same score.
+        :param alpha: the lower bound of the window
+        :param beta: the upper bound of the window
+        :param root: the inner node to search from
+        :param shared_alpha: an object whose value attribute is a lower bound that other searches may raise while
+                             this one runs, such as a multiprocessing Value, or None. It is read every time the
+                             search enters or returns to an inner node and raises the alpha of that node.
+        :param shared_beta: the same for the upper bound
+        :return: a pair (score, number of leaves examined)
+        """
+        node_types = self.node_types
+        child_offsets = self.child_offsets
+        children = self.children
+        leaf_values = self.leaf_values
+        leaves_examined = 0
+        # one frame per inner node on the path from the root: the node, its window and its next child
+        nodes = [root]
+        alphas = [alpha]
+        betas = [beta]
+        positions = [child_offsets[root]]
+        while True:
+            node = nodes[-1]
+            is_max = node_types[node] == MAX
+            alpha = alphas[-1]
+            beta = betas[-1]
+            if shared_alpha is not None and shared_alpha.value > alpha:
+                alpha = shared_alpha.value
+            if shared_beta is not None and shared_beta.value < beta:
+                beta = shared_beta.value
+            position = positions[-1]
+            end = child_offsets[node + 1]
+            # take the leaves in a row without leaving the frame, until an inner child or a cutoff
+            while position < end and alpha < beta:
+                child = children[position]
+                if child >= 0:
+                    break
+                leaves_examined += 1
+                value = leaf_values[-child - 1]
+                if is_max:
+                    if value > alpha:
+                        alpha = value
+                elif value < beta:
+                    beta = value
+                position += 1
+            if position < end and alpha < beta:
+                # enter the inner child at position
+                alphas[-1] = alpha
+                betas[-1] = beta
+                positions[-1] = position + 1
+                nodes.append(children[position])
+                alphas.append(alpha)
+                betas.append(beta)
+                positions.append(child_offsets[children[position]])
+                continue
+            # the node is done, so its value goes to its parent
+            value = alpha if is_max else beta
+            nodes.pop()
+            alphas.pop()
+            betas.pop()
+            positions.pop()
+            if not nodes:
+                return value, leaves_examined
+            if node_types[nodes[-1]] == MAX:
+                if value > alphas[-1]:
+                    alphas[-1] = value
+            elif value < betas[-1]:
+                betas[-1] = value
+
+
+def main():
+    # NAME OF INPUT FILE HERE
+    input_file_name = 'alphabeta.txt'
+    input_data_in_string = read_input(input_file_name)
+    i = 0
+    while i < len(input_data_in_string):
+        tree = ArrayGameTree.from_nodes_edges(input_data_in_string[i], input_data_in_string[i + 1])
+        score, nodes_examined = tree.alpha_beta()
+        print('Graph {}: Score: {}; Leaf Nodes Examined: {} '.format(i // 2 + 1, score, nodes_examined))
+        i += 2
+
+
+if __name__ == '__main__':
+    main()
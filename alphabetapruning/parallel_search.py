@@ -0,0 +1,189 @@
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+
+from benchmark import DEFAULT_SEED, generate_tree
+from compiled_tree import CompiledTreeFile, compile_tree_file, write_compiled_tree_file
+from game_tree import MAX, ArrayGameTree
+
+SCHEMES = ('root_split', 'young_brothers_wait')
+# the starting values of the shared bound, which lie outside of the range of the leaf values of an ArrayGameTree
+NO_LOWER_BOUND = -(1 << 63)
+NO_UPPER_BOUND = (1 << 63) - 1
+
+# the tree and the shared bound of the root, set up in every worker process once when it starts
+worker_tree = None
+worker_bound = None
+
+
+def start_worker(file_name, index, bound):
+    """
+    Opens the tree in a worker process. The compiled tree file is memory-mapped, so the workers share the pages of
+    the tree instead of each getting a pickled copy.
+    :param file_name: the name of a compiled tree file
+    :param index: the position of the tree in the file
+    :param bound: the shared bound of the root
+    """
+    global worker_tree, worker_bound
+    worker_tree = CompiledTreeFile(file_name).get_tree(index)
+    worker_bound = bound
+
+
+def search_child(child, root_is_max):
+    """
+    Searches one child of the root in a worker process with the window of the root, which it reads from the shared
+    bound while it searches, and raises or lowers the shared bound by the score it finds.
+    :param child: the number of an inner node of the tree
+    :param root_is_max: True if the root is a MAX node, whose shared bound is then its alpha
+    :return: a tuple (score, leaves examined, seconds, worker process id)
+    """
+    start_time = time.perf_counter()
+    # the bound is read without its lock, since a bound that is a little out of date is still a valid bound
+    bound = worker_bound.get_obj()
+    if root_is_max:
+        score, leaves_examined = worker_tree.alpha_beta(root=child, shared_alpha=bound)
+    else:
+        score, leaves_examined = worker_tree.alpha_beta(root=child, shared_beta=bound)
+    with worker_bound.get_lock():
+        if (score > bound.value) if root_is_max else (score < bound.value):
+            bound.value = score
+    return score, leaves_examined, time.perf_counter() - start_time, os.getpid()
+
+
+class ParallelAlphaBeta:
+    """
+    Alpha-beta search of an ArrayGameTree on a pool of worker processes, which split the children of the root:
+        'root_split': all the children of the root are searched at once
+        'young_brothers_wait': the eldest child is searched first, alone, and its score bounds the search of its
+        younger brothers, which are then searched at once
+    The workers share the best score of the root found so far in a multiprocessing Value, and every running search
+    reads it to narrow its window, so a worker profits from the children the other workers finished.
+    Both schemes only split the root: Young Brothers Wait is not applied below it, where every worker searches its
+    child sequentially. The score equals that of the sequential search, but the number of leaves examined depends on
+    the order in which the workers finish. The root needs at least as many children as there are workers to keep
+    them all busy.
+    """
+
+    def __init__(self, file_name, index=0, workers=None):
+        """
+        :param file_name: the name of a compiled tree file, which every worker maps when it starts
+        :param index: the position of the tree in the file
+        :param workers: the number of worker processes, the number of CPUs by default
+        """
+        self.compiled = CompiledTreeFile(file_name)
+        self.tree = self.compiled.get_tree(index)
+        self.workers = workers or os.cpu_count() or 1
+        self.bound = multiprocessing.Value('q', 0)
+        self.executor = ProcessPoolExecutor(self.workers, initializer=start_worker,
+                                            initargs=(file_name, index, self.bound))
+
+    def close(self):
+        self.executor.shutdown()
+        self.tree = None
+        self.compiled.close()
+
+    def search(self, scheme='young_brothers_wait'):
+        """
+        :param scheme: one of SCHEMES
+        :return: a pair (score, statistics), where the statistics are a dictionary of the leaves examined, the
+                 children of the root searched by the workers and the wall time in total, and of the children,
+                 leaves examined and seconds of search of every worker process
+        """
+        if scheme not in SCHEMES:
+            raise ValueError('unknown scheme {}, expected one of {}'.format(scheme, SCHEMES))
+        start_time = time.perf_counter()
+        tree = self.tree
+        root_is_max = tree.node_types[0] == MAX
+        self.bound.value = NO_LOWER_BOUND if root_is_max else NO_UPPER_BOUND
+        stats = {'leaves_examined': 0, 'tasks': 0, 'workers': dict()}
+
+        def merge(result):
+            score, leaves_examined, seconds, pid = result
+            worker = stats['workers'].setdefault(pid, {'tasks': 0, 'leaves_examined': 0, 'time': 0.0})
+            worker['tasks'] += 1
+            worker['leaves_examined'] += leaves_examined
+            worker['time'] += seconds
+            stats['tasks'] += 1
+            stats['leaves_examined'] += leaves_examined
+            return score
+
+        # the leaves of the root are examined here, the inner children are searched by the workers
+        scores = []
+        inner_children = []
+        for child in tree.children[tree.child_offsets[0]:tree.child_offsets[1]]:
+            if child < 0:
+                scores.append(tree.leaf_values[-child - 1])
+                stats['leaves_examined'] += 1
+            else:
+                inner_children.append(child)
+        if scores:
+            self.bound.value = max(scores) if root_is_max else min(scores)
+        if scheme == 'young_brothers_wait' and inner_children:
+            scores.append(merge(self.executor.submit(search_child, inner_children[0], root_is_max).result()))
+            inner_children = inner_children[1:]
+        futures = [self.executor.submit(search_child, child, root_is_max) for child in inner_children]
+        scores.extend(merge(future.result()) for future in futures)
+
+        if not scores:
+            score = float('-inf') if root_is_max else float('inf')
+        else:
+            score = max(scores) if root_is_max else min(scores)
+        stats['time'] = time.perf_counter() - start_time
+        return score, stats
+
+
+def main():
+    # NAME OF INPUT FILE HERE
+    input_file_name = 'alphabeta.txt'
+    directory = tempfile.mkdtemp()
+    try:
+        compiled_file_name = os.path.join(directory, 'alphabeta.abt')
+        for i in range(compile_tree_file(input_file_name, compiled_file_name)):
+            search = ParallelAlphaBeta(compiled_file_name, i)
+            try:
+                for scheme in SCHEMES:
+                    score, stats = search.search(scheme)
+                    print('Graph {}: Scheme: {}; Score: {}; Leaf Nodes Examined: {}'.format(
+                        i + 1, scheme, score, stats['leaves_examined']))
+            finally:
+                search.close()
+
+        # trees of a million leaves ordered worst move first, so that alpha-beta search prunes little and every child
+        # of the root is a large search, which takes much longer than starting the workers
+        benchmark_file_name = os.path.join(directory, 'parallel_benchmark.abt')
+        sizes = ((16, 5), (10, 6))
+        trees = (ArrayGameTree.from_nodes_edges(*generate_tree(branching, depth, 'uniform', 'worst', DEFAULT_SEED))
+                 for branching, depth in sizes)
+        write_compiled_tree_file(trees, benchmark_file_name)
+        for i, (branching, depth) in enumerate(sizes):
+            with CompiledTreeFile(benchmark_file_name) as compiled:
+                start_time = time.perf_counter()
+                score, leaves_examined = compiled.get_tree(i).alpha_beta()
+                sequential_time = time.perf_counter() - start_time
+            print('Worst ordered tree {}^{}: sequential: Score: {}; Leaf Nodes Examined: {}; Time: {:.3f}s'.format(
+                branching, depth, score, leaves_examined, sequential_time))
+            for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+                search = ParallelAlphaBeta(benchmark_file_name, i, workers)
+                try:
+                    for scheme in SCHEMES:
+                        # the first search also starts the workers, so the faster of two searches is timed
+                        parallel_score, stats = min((search.search(scheme) for _ in range(2)),
+                                                    key=lambda result: result[1]['time'])
+                        if parallel_score != score:
+                            raise AssertionError('scheme {} found score {}, the sequential search found {}'.format(
+                                scheme, parallel_score, score))
+                        print('Worst ordered tree {}^{}: {} workers: Scheme: {}; Leaf Nodes Examined: {}; '
+                              'Time: {:.3f}s; Speed-up: {:.2f}'.format(branching, depth, workers, scheme,
+                                                                       stats['leaves_examined'], stats['time'],
+                                                                       sequential_time / stats['time']))
+                finally:
+                    search.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
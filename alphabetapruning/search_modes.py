@@ -0,0 +1,275 @@
+import random
+
+import alphabeta
+from alphabeta import create_graph, read_input
+from alphabeta_test import create_tree
+from game_state import GraphNodeState
+from transposition import TranspositionTable
+
+MODES = ('alpha_beta', 'iterative_deepening', 'killer_history', 'pvs', 'mtdf')
+
+
+class EstimatedGraphNodeState(GraphNodeState):
+    """
+    A GraphNodeState that can be evaluated before its leaves, so that trees from create_graph can be searched with a
+    depth limit. An inner node is estimated by the leaf reached by always taking its first child.
+    """
+
+    def successors(self):
+        for child in self.node.children:
+            yield EstimatedGraphNodeState(child)
+
+    def evaluate(self):
+        node = self.node
+        while type(node) != int:
+            if not node.children:
+                raise ValueError('node {} has no children'.format(node.name))
+            node = node.children[0]
+        return node
+
+
+class OrderedSearch:
+    """
+    Fail-soft alpha-beta search of a GameState that orders the moves of a position before searching them:
+        the best move stored in the transposition table for the position first, which is the move of the principal
+        variation of the previous iteration of iterative deepening
+        then the killer moves, the moves that caused a cutoff in another position at the same depth
+        then the other moves by their history score, which grows every time a move causes a cutoff, more so deep in
+        the tree
+    A move is named by its number among the successors of its position, which is all a GameState says about it.
+    The search recurses once per move, so the depth of the tree is limited by the recursion limit.
+    """
+
+    def __init__(self, table=None, use_killers=False, use_history=False, principal_variation=False, stats=None):
+        """
+        :param table: a TranspositionTable, or None to search without one and without hash moves
+        :param use_killers: True to try the killer moves of a depth early
+        :param use_history: True to order the other moves by their history score
+        :param principal_variation: True for Principal Variation Search: every move after the first is searched with a
+                                    null window, which only proves that it is no better, and searched again with the
+                                    full window when it is. The scores must be integers.
+        :param stats: a SearchStatistics that counts the leaves, nodes and cutoffs of every search, or None
+        """
+        self.table = table
+        self.use_killers = use_killers
+        self.use_history = use_history
+        self.principal_variation = principal_variation
+        self.stats = stats
+        self.max_depth = None
+        self.killers = []  # the two latest killer moves of every depth
+        self.history = dict()  # the history score of every move number
+        self.leaves_examined = 0  # positions evaluated, at the end of the game or at the depth limit
+        self.estimates = 0  # positions evaluated at the depth limit, not at the end of the game
+        self.nodes_visited = 0
+        self.cutoffs = 0
+        self.researches = 0  # null window searches of Principal Variation Search that had to be searched again
+        # results that depend on the depth limit: estimates, and table results of searches with a depth limit
+        self.limited = 0
+
+    def get_counts(self):
+        """
+        :return: the counters of the search, and those of its table, as a dictionary
+        """
+        counts = {'leaves_examined': self.leaves_examined, 'estimates': self.estimates,
+                  'nodes_visited': self.nodes_visited, 'cutoffs': self.cutoffs, 'researches': self.researches}
+        if self.table is not None:
+            counts.update(('table_' + name, count) for name, count in self.table.get_counts().items())
+        return counts
+
+    def order_moves(self, state, key, depth):
+        """
+        :return: a list of (move number, successor) in the order to search them
+        """
+        moves = list(enumerate(state.successors()))
+        first = []
+        if self.table is not None:
+            first.append(self.table.get_move(key))
+        if self.use_killers and depth < len(self.killers):
+            first.extend(self.killers[depth])
+        if self.use_history:
+            # sorted is stable, so moves without a history keep their order
+            moves.sort(key=lambda move: -self.history.get(move[0], 0))
+        if first:
+            # the hash move first, then the killers, each if it is a move of this position
+            rank = {move: i for i, move in reversed(list(enumerate(first))) if 0 <= move < len(moves)}
+            moves.sort(key=lambda move: rank.get(move[0], len(rank)))
+        return moves
+
+    def record_cutoff(self, move, depth, remaining):
+        self.cutoffs += 1
+        if self.use_killers:
+            while len(self.killers) <= depth:
+                self.killers.append([])
+            killers = self.killers[depth]
+            if move not in killers:
+                killers.insert(0, move)
+                del killers[2:]
+        if self.use_history:
+            # a cutoff near the root saves a larger subtree; searches without a depth limit count 1 for every cutoff
+            self.history[move] = self.history.get(move, 0) + (remaining * remaining if remaining != float('inf')
+                                                              else 1)
+
+    def evaluate(self, state, depth):
+        value = state.evaluate()
+        if self.stats is not None:
+            self.stats.leaf(value, depth)
+        return value
+
+    def search(self, state, depth, alpha, beta):
+        """
+        :param state: the GameState of the position
+        :param depth: the number of moves from the root to the position
+        :param alpha: the lower bound of the window
+        :param beta: the upper bound of the window
+        :return: the score of the position if it is within the window, otherwise a bound on it beyond the window
+        """
+        if state.is_terminal():
+            self.leaves_examined += 1
+            return self.evaluate(state, depth)
+        if self.max_depth is not None and depth >= self.max_depth:
+            self.leaves_examined += 1
+            self.estimates += 1
+            self.limited += 1
+            return self.evaluate(state, depth)
+        remaining = self.max_depth - depth if self.max_depth is not None else float('inf')
+        key = None
+        if self.table is not None:
+            key = state.key()
+            value = self.table.probe(key, remaining, alpha, beta, fail_soft=True)
+            if value is not None:
+                if self.table.depths[self.table.find(key)] != float('inf'):
+                    self.limited += 1
+                return value
+        if self.stats is not None:
+            self.stats.node(state, depth)
+        window = (alpha, beta)
+        limited = self.limited
+        is_max = state.is_max_to_move()
+        best = float('-inf') if is_max else float('inf')
+        best_move = -1
+        for i, (move, child) in enumerate(self.order_moves(state, key, depth)):
+            self.nodes_visited += 1
+            if self.principal_variation and i > 0:
+                # the first move set alpha or beta to a score, so the null window is finite
+                if is_max:
+                    value = self.search(child, depth + 1, alpha, alpha + 1)
+                else:
+                    value = self.search(child, depth + 1, beta - 1, beta)
+                if alpha < value < beta:
+                    self.researches += 1
+                    value = self.search(child, depth + 1, alpha, beta)
+            else:
+                value = self.search(child, depth + 1, alpha, beta)
+            if is_max:
+                if value > best:
+                    best, best_move = value, move
+                    alpha = max(alpha, value)
+            elif value < best:
+                best, best_move = value, move
+                beta = min(beta, value)
+            if alpha >= beta:
+                self.record_cutoff(move, depth, remaining)
+                if self.stats is not None:
+                    self.stats.cutoff(state, depth)
+                break
+        if self.table is not None:
+            # a position searched without reaching the depth limit has its score to the end of the game
+            self.table.store(key, best, remaining if self.limited > limited else float('inf'), window[0],
+                             window[1], best_move)
+        return best
+
+    def mtdf(self, state, guess):
+        """
+        MTD(f): finds the score of a position with null window searches only, each of which proves that the score is
+        above or below a guess. It needs a transposition table, so that the searches do not do the same work again,
+        and integer scores.
+        :param state: the GameState of the position
+        :param guess: a first guess of the score, such as the score of the previous iteration
+        :return: the score of the position
+        """
+        lower, upper = float('-inf'), float('inf')
+        value = guess
+        while lower < upper:
+            beta = value + 1 if value == lower else value
+            value = self.search(state, 0, beta - 1, beta)
+            if value < beta:
+                upper = value
+            else:
+                lower = value
+        return value
+
+    def iterative_deepening(self, state, use_mtdf=False, max_depth=None):
+        """
+        Searches the position one move deeper at a time until a search reaches the end of the game everywhere, or
+        max_depth. The transposition table keeps the best moves of every iteration for the ordering of the next one.
+        :param state: the GameState of the position
+        :param use_mtdf: True to search every iteration with MTD(f), starting from the score of the previous iteration
+        :param max_depth: the deepest iteration, or None to search to the end of the game
+        :return: the score of the position
+        """
+        value = 0
+        depth = 1
+        while True:
+            self.max_depth = depth
+            limited = self.limited
+            if use_mtdf:
+                value = self.mtdf(state, value)
+            else:
+                value = self.search(state, 0, float('-inf'), float('inf'))
+            if self.limited == limited or depth == max_depth:
+                return value
+            depth += 1
+
+
+def run_mode(mode, state, table_entries=1 << 16):
+    """
+    :param mode: one of MODES
+    :param state: the GameState at the root, which must be able to evaluate positions before the end of the game for
+                  every mode but alpha_beta
+    :param table_entries: the size of the transposition table of the modes that use one
+    :return: a pair (score, the OrderedSearch with its counters)
+    """
+    if mode not in MODES:
+        raise ValueError('unknown search mode {}, expected one of {}'.format(mode, MODES))
+    if mode == 'alpha_beta':
+        # the moves in the order of the input, as alphabeta.alpha_beta searches them
+        search = OrderedSearch()
+        return search.search(state, 0, float('-inf'), float('inf')), search
+    table = TranspositionTable(table_entries)
+    if mode == 'iterative_deepening':
+        search = OrderedSearch(table)
+    else:
+        search = OrderedSearch(table, use_killers=True, use_history=True, principal_variation=mode == 'pvs')
+    return search.iterative_deepening(state, use_mtdf=mode == 'mtdf'), search
+
+
+def compare_modes(graph, label):
+    expected = alphabeta.alpha_beta(GraphNodeState(graph), float('-inf'), float('inf'))
+    for mode in MODES:
+        score, search = run_mode(mode, EstimatedGraphNodeState(graph))
+        if score != expected:
+            raise AssertionError('{}: mode {} found score {}, alpha_beta found {}'.format(label, mode, score,
+                                                                                          expected))
+        print('{}: Mode: {}; Score: {}; Leaf Nodes Examined: {} ({} at the depth limit); Nodes Visited: {}'.format(
+            label, mode, score, search.leaves_examined, search.estimates, search.nodes_visited))
+
+
+def main():
+    # NAME OF INPUT FILE HERE
+    input_file_name = 'alphabeta.txt'
+    input_data_in_string = read_input(input_file_name)
+    i = 0
+    while i < len(input_data_in_string):
+        compare_modes(create_graph(input_data_in_string[i], input_data_in_string[i + 1]), 'Graph {}'.format(i // 2 + 1))
+        i += 2
+    random.seed(0)
+    for branching, depth in ((4, 8), (8, 6), (16, 4)):
+        compare_modes(create_graph(*create_tree(branching, depth)), 'Random tree {}^{}'.format(branching, depth))
+    # leaf values close to those of their neighbours, so that the estimates at the depth limit order the moves well
+    for branching, depth in ((4, 8), (8, 6), (16, 4)):
+        compare_modes(create_graph(*create_tree(branching, depth, -1000, 1000, step=20)),
+                      'Random walk tree {}^{}'.format(branching, depth))
+
+
+if __name__ == '__main__':
+    main()
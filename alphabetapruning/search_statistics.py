@@ -0,0 +1,91 @@
+import time
+
+
+class SearchStatistics:
+    """
+    Collects the counters and the time of one alpha-beta search. alphabeta.alpha_beta takes an optional stats
+    argument, and game_state.AlphaBetaSearch and search_modes.OrderedSearch an optional stats for all their searches;
+    when it is None the search counts nothing and does no extra work beyond one test per node.
+    The hooks on_leaf(value, depth), on_node(node, depth) and on_cutoff(node, depth) are called on every leaf
+    examined, inner node visited and cutoff, so a tracer can be attached to a search without changing it.
+    """
+
+    def __init__(self, on_leaf=None, on_node=None, on_cutoff=None):
+        self.on_leaf = on_leaf
+        self.on_node = on_node
+        self.on_cutoff = on_cutoff
+        self.leaves_examined = 0
+        self.nodes_visited = 0  # inner nodes
+        self.cutoffs = []  # the number of cutoffs at every depth, the root being at depth 0
+        self.max_depth = 0  # the depth of the deepest leaf examined
+        self.start_time = None
+        self.search_time = 0.0
+
+    def start(self):
+        """
+        Marks the start of the search.
+        """
+        self.start_time = time.perf_counter()
+
+    def stop(self):
+        """
+        Marks the end of the search.
+        """
+        if self.start_time is not None:
+            self.search_time += time.perf_counter() - self.start_time
+            self.start_time = None
+
+    def leaf(self, value, depth):
+        """
+        Counts a leaf examined.
+        :param value: the value of the leaf
+        :param depth: the number of moves from the root to the leaf
+        """
+        self.leaves_examined += 1
+        if depth > self.max_depth:
+            self.max_depth = depth
+        if self.on_leaf is not None:
+            self.on_leaf(value, depth)
+
+    def node(self, node, depth):
+        """
+        Counts an inner node visited.
+        :param node: the GameState of the node
+        :param depth: the number of moves from the root to the node
+        """
+        self.nodes_visited += 1
+        if self.on_node is not None:
+            self.on_node(node, depth)
+
+    def cutoff(self, node, depth):
+        """
+        Counts a cutoff, the children of a node left unsearched because its window closed.
+        :param node: the GameState of the node
+        :param depth: the number of moves from the root to the node
+        """
+        while len(self.cutoffs) <= depth:
+            self.cutoffs.append(0)
+        self.cutoffs[depth] += 1
+        if self.on_cutoff is not None:
+            self.on_cutoff(node, depth)
+
+    def effective_branching_factor(self):
+        """
+        :return: the branching factor of a uniform tree as deep as the search went with as many leaves as it
+                 examined, the d-th root of the number of leaves for a depth d
+        """
+        if self.max_depth == 0:
+            return float(self.leaves_examined)
+        return self.leaves_examined ** (1.0 / self.max_depth)
+
+    def record(self):
+        """
+        :return: the counters and timings as a dictionary
+        """
+        return {'leaves_examined': self.leaves_examined,
+                'nodes_visited': self.nodes_visited,
+                'cutoffs': sum(self.cutoffs),
+                'cutoffs_per_depth': list(self.cutoffs),
+                'max_depth': self.max_depth,
+                'effective_branching_factor': self.effective_branching_factor(),
+                'search_time': self.search_time}
@@ -0,0 +1,233 @@
+import sys
+import zlib
+
+from alphabeta import create_graph, read_input
+from game_state import AlphaBetaSearch, GraphNodeState
+
+EXACT = 0
+LOWER = 1  # the value is a lower bound of the score, the search failed high
+UPPER = 2  # the value is an upper bound of the score, the search failed low
+
+POLICIES = ('depth', 'always', 'two_tier')
+# the memory of one slot: one list element for each of key, value, depth, bound, move and, with max_bytes, size
+SLOT_BYTES = 6 * 8
+# the memory of the objects of a result keyed by a short string, such as the name of a GraphNodeState, used to
+# choose the number of slots for max_bytes
+ENTRY_BYTES = sys.getsizeof('AB') + sys.getsizeof(1 << 40) + sys.getsizeof(float('inf')) + sys.getsizeof(1 << 40)
+
+
+def object_bytes(value):
+    """
+    :return: the bytes of an object as sys.getsizeof counts them, together with the items of a tuple or frozenset,
+             which a key made of several parts is
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, (tuple, frozenset)):
+        size += sum(object_bytes(item) for item in value)
+    return size
+
+
+class TranspositionTable:
+    """
+    A table of search results keyed by position, so that a position reached through several parents is only
+    searched once. The table has a fixed number of slots, allocated up front, and a position can only go into the
+    slots of its hash, so the number of results never grows. When the slots of a position are taken, the
+    replacement policy decides what is kept:
+        'depth': keep the result searched to the larger depth, which cost more to find
+        'always': keep the newest result
+        'two_tier': two slots per hash, one kept by depth and one always replaced
+    With max_bytes the memory of the table is capped: the lists of slots and the key, value, depth and move objects
+    the table keeps alive, measured by object_bytes, are kept within max_bytes, and a result that does not fit is
+    not stored. An object shared by several results is counted for each of them, so the cap is never too high.
+    """
+
+    def __init__(self, max_entries=1 << 16, policy='depth', max_bytes=None):
+        """
+        :param max_entries: the number of results the table can hold
+        :param policy: the replacement policy, one of POLICIES
+        :param max_bytes: if given, the most bytes the table may take, and the number of entries is set so that as
+                          many results keyed by short strings fit
+        """
+        if policy not in POLICIES:
+            raise ValueError('unknown replacement policy {}, expected one of {}'.format(policy, POLICIES))
+        if max_bytes is not None:
+            max_entries = max_bytes // (SLOT_BYTES + ENTRY_BYTES)
+        self.policy = policy
+        self.ways = 2 if policy == 'two_tier' else 1
+        self.num_buckets = max(1, max_entries // self.ways)
+        size = self.num_buckets * self.ways
+        self.keys = [None] * size
+        self.values = [0] * size
+        self.depths = [0] * size
+        self.bounds = [EXACT] * size
+        self.moves = [-1] * size
+        self.max_bytes = max_bytes
+        self.sizes = None  # the bytes of the objects of every slot, only counted with max_bytes
+        self.used_bytes = 0
+        if max_bytes is not None:
+            self.sizes = [0] * size
+            self.used_bytes = sum(sys.getsizeof(slots) for slots in (self.keys, self.values, self.depths,
+                                                                     self.bounds, self.moves, self.sizes))
+            if self.used_bytes > max_bytes:
+                raise ValueError('the slots of the table take {} bytes, more than max_bytes {}'.format(
+                    self.used_bytes, max_bytes))
+        self.hits = 0
+        self.misses = 0
+        self.cutoffs = 0
+        self.stores = 0
+        self.replacements = 0  # stores that dropped the result of another position
+        self.refused = 0  # results not stored because they did not fit in max_bytes
+
+    def __len__(self):
+        return len(self.keys)
+
+    def clear_counts(self):
+        self.hits = 0
+        self.misses = 0
+        self.cutoffs = 0
+        self.stores = 0
+        self.replacements = 0
+        self.refused = 0
+
+    def first_slot(self, key):
+        """
+        :param key: the key of a position
+        :return: the first slot of the bucket of the position
+        """
+        if isinstance(key, str):
+            # hash() of a string changes from run to run with PYTHONHASHSEED, and so would the collisions in the table
+            # and the counters of the searches, so the names of GraphNodeStates are hashed with CRC-32
+            return (zlib.crc32(key.encode()) % self.num_buckets) * self.ways
+        return (hash(key) % self.num_buckets) * self.ways
+
+    def find(self, key):
+        """
+        :param key: the key of a position
+        :return: the slot holding the result of the position, or -1 if there is none
+        """
+        first = self.first_slot(key)
+        for slot in range(first, first + self.ways):
+            if self.keys[slot] == key:
+                return slot
+        return -1
+
+    def probe(self, key, depth, alpha, beta, fail_soft=False):
+        """
+        Looks a position up before searching it.
+        :param key: the key of the position
+        :param depth: the depth the position is about to be searched to
+        :param alpha: the lower bound of the window
+        :param beta: the upper bound of the window
+        :param fail_soft: True to return the stored value as it is, for a fail-soft search, instead of within the
+                          window
+        :return: the score of the position if a stored result decides it, otherwise None
+        """
+        slot = self.find(key)
+        if slot < 0:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if self.depths[slot] < depth:
+            return None
+        value = self.values[slot]
+        bound = self.bounds[slot]
+        if not (bound == EXACT or (bound == LOWER and value >= beta) or (bound == UPPER and value <= alpha)):
+            return None
+        self.cutoffs += 1
+        if fail_soft:
+            return value
+        # keep the fail-hard result within the window
+        return max(alpha, min(beta, value))
+
+    def store(self, key, value, depth, alpha, beta, move=-1):
+        """
+        Stores the result of a fail-hard or fail-soft search of a position.
+        :param key: the key of the position
+        :param value: the score the search returned
+        :param depth: the depth the position was searched to
+        :param alpha: the lower bound of the window the position was searched with
+        :param beta: the upper bound of the window the position was searched with
+        :param move: the number of the best move found by the search, or -1
+        """
+        if value <= alpha:
+            bound = UPPER
+        elif value >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        first = self.first_slot(key)
+        slot = first
+        if self.policy == 'two_tier':
+            second = first + 1
+            if self.keys[first] not in (None, key) and self.depths[first] > depth:
+                slot = second
+            elif self.keys[first] not in (None, key):
+                # the result that loses the first slot moves to the second, dropping the result there
+                if self.keys[second] not in (None, key):
+                    self.replacements += 1
+                self.write(second, self.keys[first], self.values[first], self.depths[first], self.bounds[first],
+                           self.moves[first])
+                self.keys[first] = None
+            elif self.keys[second] == key:
+                self.keys[second] = None  # an older result of the position
+        elif self.policy == 'depth' and self.keys[first] not in (None, key) and self.depths[first] > depth:
+            return
+        if self.keys[slot] not in (None, key):
+            self.replacements += 1
+        if self.write(slot, key, value, depth, bound, move):
+            self.stores += 1
+
+    def write(self, slot, key, value, depth, bound, move):
+        """
+        :return: True if the result was written, False if it did not fit in max_bytes
+        """
+        if self.sizes is not None:
+            size = object_bytes(key) + sys.getsizeof(value) + sys.getsizeof(depth) + sys.getsizeof(move)
+            used_bytes = self.used_bytes - self.sizes[slot] + size
+            if used_bytes > self.max_bytes:
+                self.refused += 1
+                return False
+            self.used_bytes = used_bytes
+            self.sizes[slot] = size
+        self.keys[slot] = key
+        self.values[slot] = value
+        self.depths[slot] = depth
+        self.bounds[slot] = bound
+        self.moves[slot] = move
+        return True
+
+    def get_move(self, key):
+        """
+        :param key: the key of a position
+        :return: the best move stored for the position, whatever its depth, or -1
+        """
+        slot = self.find(key)
+        return self.moves[slot] if slot >= 0 else -1
+
+    def get_counts(self):
+        """
+        :return: the counters of the table as a dictionary
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'cutoffs': self.cutoffs, 'stores': self.stores,
+                'replacements': self.replacements, 'refused': self.refused}
+
+
+def main():
+    # NAME OF INPUT FILE HERE
+    input_file_name = 'alphabeta.txt'
+    input_data_in_string = read_input(input_file_name)
+    for policy in POLICIES:
+        print('Replacement policy:', policy)
+        i = 0
+        while i < len(input_data_in_string):
+            graph = create_graph(input_data_in_string[i], input_data_in_string[i + 1])
+            table = TranspositionTable(1 << 10, policy)
+            search = AlphaBetaSearch(table=table)
+            score = search.search(GraphNodeState(graph))
+            print('Graph {}: Score: {}; Leaf Nodes Examined: {}; Table hits: {}; misses: {}; cutoffs: {}'.format(
+                i // 2 + 1, score, search.leaves_examined, table.hits, table.misses, table.cutoffs))
+            i += 2
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,233 @@
+import os
+import random
+import re
+import string
+import tempfile
+import time
+
+# the characters of a name of a node or of the value of a leaf, the characters read_input reads into them
+TOKEN_CHARACTERS = b'-' + bytes(string.ascii_letters + string.digits, 'ascii')
+TOKEN = r'[-A-Za-z0-9]+'
+# the longest start of a set body that is well formed, the pairs followed by commas and then the start of a pair,
+# and the first character that does not belong after it, found after a set failed to parse
+BAD_CHARACTER = re.compile(r'\s*(?:\(\s*' + TOKEN + r'\s*,\s*' + TOKEN + r'\s*\)\s*,\s*)*'
+                           r'(?:\(\s*(?:' + TOKEN + r'\s*(?:,\s*(?:' + TOKEN + r'\s*(?:\)\s*)?)?)?)?)?(.)', re.DOTALL)
+LEAF_VALUE = re.compile(r'-?[0-9]+')
+WHITE_SPACE = re.compile(r'\s*')
+NODE_TYPES = ('MAX', 'MIN')
+
+
+class TreeParseError(ValueError):
+    """
+    An error in an alpha-beta input file, with the line and column, both counted from 1, where it was found.
+    """
+
+    def __init__(self, message, line, column):
+        ValueError.__init__(self, 'line {}, column {}: {}'.format(line, column, message))
+        self.line = line
+        self.column = column
+
+
+class Position:
+    """
+    Turns offsets in a file read in chunks into lines and columns, counting the newlines of the text it is given.
+    """
+
+    def __init__(self):
+        self.offset = 0  # the offset of the start of the text
+        self.line = 1  # the line of the start of the text
+        self.line_offset = 0  # the offset of the start of that line
+
+    def advance(self, text, end):
+        """
+        Moves the start of the text to end.
+        """
+        newlines = text.count('\n', 0, end)
+        if newlines:
+            self.line += newlines
+            self.line_offset = self.offset + text.rindex('\n', 0, end) + 1
+        self.offset += end
+
+    def error(self, message, text, index):
+        """
+        :return: a TreeParseError at index in the text
+        """
+        line = self.line + text.count('\n', 0, index)
+        line_start = text.rfind('\n', 0, index)
+        column = index - line_start if line_start >= 0 else self.offset + index - self.line_offset + 1
+        return TreeParseError(message, line, column)
+
+
+def parse_set(text, start, end, position):
+    """
+    Parses a set with string methods instead of going through it one character at a time: once the white space is
+    removed, the pairs are split at their commas, and the set is well formed if what is left when the names are
+    removed is (,),(,),...,(,)
+    :param text: the text holding the set
+    :param start: the index of the { of the set
+    :param end: the index of the } of the set
+    :param position: the Position of the start of the text
+    :return: the names in the pairs of the set, as one list of strings, two per pair
+    """
+    body = ''.join(text[start + 1:end].split())
+    if not body:
+        return []
+    num_pairs = body.count('),(') + 1
+    skeleton = body.encode('ascii', 'replace').translate(None, TOKEN_CHARACTERS)
+    if skeleton == b'(,),' * (num_pairs - 1) + b'(,)':
+        tokens = body[1:-1].replace('),(', ',').split(',')
+        if '' not in tokens:
+            return tokens
+    match = BAD_CHARACTER.match(text, start + 1, end + 1)
+    character = match.group(1)
+    if match.start(1) == end:
+        raise position.error('unexpected end of the set', text, end)
+    raise position.error('unexpected {!r} in a set'.format(character), text, match.start(1))
+
+
+def find_pair(text, start, pattern, count=1):
+    """
+    :return: the index of the count-th match of the pattern in the text after start, or start if there is none
+    """
+    for i, match in enumerate(re.compile(pattern).finditer(text, start)):
+        if i + 1 == count:
+            return match.start()
+    return start
+
+
+def pairs(tokens):
+    tokens = iter(tokens)
+    return list(zip(tokens, tokens))
+
+
+def check_nodes(tokens, text, start, position):
+    """
+    Checks that a graph has nodes, that they are MAX or MIN and that every name is used once.
+    :param tokens: the names and types of the nodes, as returned by parse_set
+    :return: the set of the names of the nodes
+    """
+    if not tokens:
+        raise position.error('a graph needs at least one node', text, start)
+    nodes = pairs(tokens)
+    bad_types = set(tokens[1::2]).difference(NODE_TYPES)
+    if bad_types:
+        name, node_type = next(node for node in nodes if node[1] in bad_types)
+        raise position.error('node {} has type {}, expected MAX or MIN'.format(name, node_type), text,
+                             find_pair(text, start, r'\(\s*' + re.escape(name) + r'\s*,'))
+    names = set(tokens[0::2])
+    if len(names) < len(nodes):
+        seen = set()
+        name = next(name for name, _ in nodes if name in seen or seen.add(name))
+        raise position.error('node {} is declared twice'.format(name), text,
+                             find_pair(text, start, r'\(\s*' + re.escape(name) + r'\s*,', 2))
+    return names
+
+
+def check_edges(names, tokens, text, start, position):
+    """
+    Checks that the edges of a graph go from its nodes to its nodes or to leaf values.
+    :param names: the set of the names of the nodes
+    :param tokens: the parents and children of the edges, as returned by parse_set
+    """
+    if not names.issuperset(tokens[0::2]):
+        name = next(parent for parent in tokens[0::2] if parent not in names)
+        raise position.error('edge from {}, which is not a node'.format(name), text,
+                             find_pair(text, start, r'\(\s*' + re.escape(name) + r'\s*,'))
+    bad_children = [child for child in set(tokens[1::2]).difference(names) if not LEAF_VALUE.fullmatch(child)]
+    if bad_children:
+        name = next(child for child in tokens[1::2] if child in bad_children)
+        raise position.error('edge to {}, which is neither a node nor a leaf value'.format(name), text,
+                             find_pair(text, start, r',\s*' + re.escape(name) + r'\s*\)'))
+
+
+def iter_graphs(file_name, chunk_size=1 << 20):
+    """
+    Reads the graphs of an alpha-beta input file one at a time, so that only the graph being read is held in memory.
+    A graph is a set of (name, type) nodes followed by a set of (parent, child) edges, where the first node is the
+    root, names are made of letters and digits and a child that is not a node is the value of a leaf.
+    :param file_name: input file name
+    :param chunk_size: the number of characters to read at a time
+    :return: a generator of pairs (nodes, edges), lists of tuples of strings as read by alphabeta.read_input
+    :raise TreeParseError: if the file is not made of such graphs, separated by white space
+    """
+    position = Position()
+    nodes = None  # the nodes of the graph whose edges are being read
+    names = None
+    text = ''
+    at_end = False
+    with open(file_name, 'r') as file:
+        while True:
+            index = 0
+            while True:
+                start = WHITE_SPACE.match(text, index).end()
+                if start == len(text):
+                    break
+                if text[start] != '{':
+                    raise position.error('expected {{, found {!r}'.format(text[start]), text, start)
+                end = text.find('}', start)
+                if end < 0:
+                    break
+                tokens = parse_set(text, start, end, position)
+                if nodes is None:
+                    names = check_nodes(tokens, text, start, position)
+                    nodes = pairs(tokens)
+                else:
+                    check_edges(names, tokens, text, start, position)
+                    yield nodes, pairs(tokens)
+                    nodes = None
+                index = end + 1
+            if at_end:
+                if start < len(text):
+                    raise position.error('the set is not closed', text, start)
+                if nodes is not None:
+                    raise position.error('the graph has no set of edges', text, len(text))
+                return
+            # keep the start of a set that is not closed yet
+            position.advance(text, start)
+            pieces = [text[start:]]
+            # read until the set is closed, without joining the pieces over and over
+            while True:
+                chunk = file.read(chunk_size)
+                if not chunk:
+                    at_end = True
+                    break
+                pieces.append(chunk)
+                if '}' in chunk:
+                    break
+            text = ''.join(pieces)
+
+
+def main():
+    # compare the speed of iter_graphs and read_input on a file of random trees
+    from alphabeta import read_input
+    from alphabeta_test import create_tree, write_tree
+
+    random.seed(0)
+    descriptor, file_name = tempfile.mkstemp(suffix='.txt')
+    try:
+        with os.fdopen(descriptor, 'w') as file:
+            for _ in range(10):
+                write_tree(*create_tree(8, 6), file)
+        # the graphs are streamed, one at a time, as a program that searches them would read them
+        start_time = time.perf_counter()
+        num_graphs = 0
+        for _ in iter_graphs(file_name):
+            num_graphs += 1
+        iter_graphs_time = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        expected = read_input(file_name)
+        read_input_time = time.perf_counter() - start_time
+        graphs = []
+        for nodes, edges in iter_graphs(file_name):
+            graphs.extend((nodes, edges))
+        if graphs != expected:
+            raise AssertionError('iter_graphs and read_input read different graphs')
+        print('{} bytes, {} graphs: read_input: {:.3f}s; iter_graphs: {:.3f}s; {:.1f} times faster'.format(
+            os.path.getsize(file_name), num_graphs, read_input_time, iter_graphs_time,
+            read_input_time / iter_graphs_time))
+    finally:
+        os.remove(file_name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import os
+import time
+
+from grid import FlatGrid
+from pathfinding import PathFinding, iter_mazes
+
+ALGORITHMS = {('Greedy', False): PathFinding.greedy_search_up_down,
+              ('A*', False): PathFinding.a_star_search_up_down,
+              ('Greedy', True): PathFinding.greedy_search_diagonal,
+              ('A*', True): PathFinding.a_star_search_diagonal}
+
+# the shared memory block with the mazes, attached once in every worker process
+worker_memory = None
+
+
+def attach_shared_memory(name):
+    global worker_memory
+    worker_memory = shared_memory.SharedMemory(name=name)
+
+
+def solve_job(job):
+    """
+    Solves one maze in the shared memory block with one algorithm and movement model.
+    The maze is searched in place: the block holds its cells in the padded layout of FlatGrid, so nothing is copied or
+    parsed per job.
+    :param job: a tuple (offset, number of rows, number of columns, start state, goal state, algorithm name, diagonal)
+    :return: the result maze as text, one line per row
+    """
+    offset, num_rows, num_cols, start_state, goal_state, algorithm, diagonal = job
+    size = (num_rows + 2) * (num_cols + 2)
+    grid = FlatGrid.from_buffer(worker_memory.buf[offset:offset + size], num_rows, num_cols, start_state, goal_state)
+    path_finding = PathFinding.from_flat_grid(grid)
+    path = path_finding.get_path(ALGORITHMS[(algorithm, diagonal)](path_finding))
+    if path is None:
+        print('    There is no solution for this maze.')
+    return ''.join(row + '\n' for row in path_finding.iter_result_rows(path))
+
+
+def solve_files(files, processes=None):
+    """
+    Solves every maze of the input files with greedy search and A* using a pool of processes.
+    The mazes are read from the input files into FlatGrids whose cells are copied into one shared memory block, which
+    the workers search in place, and the results are written in the same order and layout as pathfinding.main.
+    :param files: a list of (input file name, output file name, diagonal)
+    :param processes: the number of worker processes, the number of CPUs by default
+    """
+    grids = []
+    mazes_per_file = []
+    for input_file_name, _, diagonal in files:
+        num_mazes = 0
+        for maze in iter_mazes(input_file_name):
+            grids.append((PathFinding(maze).get_flat_grid(), diagonal))
+            num_mazes += 1
+        mazes_per_file.append(num_mazes)
+    memory = shared_memory.SharedMemory(create=True, size=max(1, sum(len(grid.cells) for grid, _ in grids)))
+    try:
+        jobs = []
+        offset = 0
+        for grid, diagonal in grids:
+            memory.buf[offset:offset + len(grid.cells)] = grid.cells
+            start_state = grid.state(grid.start_index) if grid.start_index is not None else None
+            goal_state = grid.state(grid.goal_index) if grid.goal_index is not None else None
+            for algorithm in ('Greedy', 'A*'):
+                jobs.append((offset, grid.num_rows, grid.num_cols, start_state, goal_state, algorithm, diagonal))
+            offset += len(grid.cells)
+        del grids
+        processes = processes or os.cpu_count() or 1
+        with ProcessPoolExecutor(processes, initializer=attach_shared_memory, initargs=(memory.name,)) as executor:
+            results = iter(executor.map(solve_job, jobs, chunksize=max(1, len(jobs) // (4 * processes))))
+            for num_mazes, (_, output_file_name, _) in zip(mazes_per_file, files):
+                with open(output_file_name, 'w') as file:
+                    for _ in range(num_mazes):
+                        file.write('Greedy\n' + next(results))
+                        file.write('A*\n' + next(results) + '\n')
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def main():
+    st = time.time()
+    solve_files([('pathfinding_a.txt', 'pathfinding_a_out.txt', False),
+                 ('pathfinding_b.txt', 'pathfinding_b_out.txt', True)])
+    print("the time used for all mazes is", time.time() - st)
+
+
+if __name__ == '__main__':
+    main()
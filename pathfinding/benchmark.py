@@ -0,0 +1,252 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import hierarchical
+import landmarks
+import pathfinding
+from pathfinding import PathFinding
+from pathfinding_test import create_maze
+from search_stats import SearchStats
+
+# a map from a method name to the name of its search without the movement model, and whether it uses the flat grid
+METHODS = {'greedy': ('greedy_search', False),
+           'greedy_flat': ('greedy_search', True),
+           'a_star': ('a_star_search', False),
+           'a_star_flat': ('a_star_search', True),
+           'landmark_a_star': ('landmark_a_star_search', True),
+           'bidirectional_a_star': ('bidirectional_a_star_search', False),
+           'jump_point': ('jump_point_search', False),
+           'hierarchical': ('hierarchical_search', False)}
+MOVEMENTS = ('up_down', 'diagonal')
+
+DEFAULT_SIZES = ((50, 50), (100, 100), (300, 300), (1000, 1000))
+DEFAULT_PROBABILITIES = (0.1, 0.2, 0.3)
+DEFAULT_SEED = 2019
+
+# the fields of a result that identify a run, and the measurements compared between two result files
+KEY_FIELDS = ('rows', 'cols', 'blocked_probability', 'seed', 'method', 'movement')
+COUNT_FIELDS = ('nodes_expanded', 'stale_pops', 'heap_operations', 'max_frontier')
+
+
+def generate_maze(rows, cols, blocked_probability, seed):
+    """
+    Creates the same maze for the same arguments on every run and every machine.
+    :param rows: the number of rows of the maze
+    :param cols: the number of columns of the maze
+    :param blocked_probability: the probability of an inner cell being blocked
+    :param seed: the seed of the benchmark
+    :return: the maze as a 2D list
+    """
+    # a string seed is hashed with SHA-512 by random.seed, so it does not depend on PYTHONHASHSEED
+    random.seed('{}:{}x{}:{}'.format(seed, rows, cols, blocked_probability))
+    return create_maze(rows, cols, blocked_probability)
+
+
+def clear_caches():
+    """
+    Empties the caches shared between PathFinding instances, so that every run pays for the tables it builds.
+    """
+    pathfinding.distance_fields.entries.clear()
+    hierarchical.abstract_graphs.entries.clear()
+    landmarks.landmark_tables.entries.clear()
+
+
+def run_search(maze, method, movement, stats=None):
+    """
+    Runs one search on a new PathFinding of the maze.
+    :param maze: the maze as a 2D list
+    :param method: a key of METHODS
+    :param movement: 'up_down' or 'diagonal'
+    :param stats: a SearchStats to pass to the search, or None
+    :return: the path as a SearchPath, or None if there is no path
+    """
+    search_name, flat_grid = METHODS[method]
+    clear_caches()
+    path_finding = PathFinding(maze, flat_grid=flat_grid)
+    search = getattr(path_finding, search_name + '_' + movement)
+    return path_finding.get_path(search(stats=stats))
+
+
+def measure(maze, method, movement, repeat=3, track_memory=True):
+    """
+    Runs one search of the benchmark and measures it.
+    The wall time is the smallest of repeat runs without stats or tracemalloc, which slow the search down. The
+    counters come from one more run with a SearchStats, and the peak memory from another run under tracemalloc.
+    :param maze: the maze as a 2D list
+    :param method: a key of METHODS
+    :param movement: 'up_down' or 'diagonal'
+    :param repeat: the number of timed runs
+    :param track_memory: False to skip the run that measures the peak memory
+    :return: a dictionary of the measurements
+    """
+    wall_time = float('inf')
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        path = run_search(maze, method, movement)
+        wall_time = min(wall_time, time.perf_counter() - start_time)
+    stats = SearchStats()
+    run_search(maze, method, movement, stats)
+    record = stats.record()
+
+    peak_memory = None
+    if track_memory:
+        tracemalloc.start()
+        run_search(maze, method, movement)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {'wall_time': wall_time,
+            'nodes_expanded': record['nodes_expanded'],
+            'stale_pops': record['stale_pops'],
+            'heap_operations': record['pushes'] + record['pops'],
+            'max_frontier': record['max_frontier'],
+            'neighbour_time': record['neighbour_time'],
+            'heuristic_time': record['heuristic_time'],
+            'peak_memory': peak_memory,
+            'path_length': path.length if path is not None else None,
+            'path_cost': path.cost if path is not None else None}
+
+
+def run_benchmark(sizes, probabilities, methods, seed, repeat=3, track_memory=True):
+    """
+    Runs every method with every movement model on one seeded maze per size and blocked probability.
+    :param sizes: a list of (rows, cols)
+    :param probabilities: a list of blocked probabilities
+    :param methods: a list of keys of METHODS
+    :param seed: the seed the mazes are generated from
+    :param repeat: the number of timed runs of every search
+    :param track_memory: False to skip measuring the peak memory
+    :return: a list of results, one dictionary per run
+    """
+    results = []
+    for rows, cols in sizes:
+        for blocked_probability in probabilities:
+            maze = generate_maze(rows, cols, blocked_probability, seed)
+            for method in methods:
+                for movement in MOVEMENTS:
+                    result = {'rows': rows, 'cols': cols, 'cells': rows * cols,
+                              'blocked_probability': blocked_probability, 'seed': seed,
+                              'method': method, 'movement': movement}
+                    result.update(measure(maze, method, movement, repeat, track_memory))
+                    print('{}x{} p={} {} {}: {:.4f}s, {} expanded, path length {}'.format(
+                        rows, cols, blocked_probability, method, movement, result['wall_time'],
+                        result['nodes_expanded'], result['path_length']))
+                    results.append(result)
+    return results
+
+
+def print_scaling_curves(results):
+    """
+    Prints the wall time of every method and movement model against the number of cells, one line per curve.
+    :param results: a list of results of run_benchmark
+    """
+    curves = dict()
+    for result in results:
+        key = (result['method'], result['movement'], result['blocked_probability'])
+        curves.setdefault(key, []).append((result['cells'], result['wall_time']))
+    print()
+    print('Wall time in seconds against the number of cells:')
+    for (method, movement, blocked_probability), points in sorted(curves.items()):
+        print('    {} {} p={}: {}'.format(method, movement, blocked_probability, ', '.join(
+            '{}: {:.4f}'.format(cells, wall_time) for cells, wall_time in sorted(points))))
+
+
+def write_results(results, file_name):
+    """
+    Writes the results of a benchmark to a JSON file together with the Python version they were measured with.
+    :param results: a list of results of run_benchmark
+    :param file_name: the output file name
+    """
+    with open(file_name, 'w') as file:
+        json.dump({'python': platform.python_version(),
+                   'machine': platform.machine(),
+                   'results': results}, file, indent=1)
+
+
+def read_results(file_name):
+    with open(file_name) as file:
+        return json.load(file)['results']
+
+
+def compare_results(old_results, new_results, time_tolerance=0.2, min_time=0.01):
+    """
+    Finds the runs of a new benchmark that are worse than the same runs of an old one.
+    A run regresses when its wall time or peak memory grows by more than time_tolerance, when one of the counters of
+    COUNT_FIELDS grows, or when its path length changes.
+    :param old_results: the results of the old benchmark
+    :param new_results: the results of the new benchmark
+    :param time_tolerance: the relative growth of wall time and peak memory that is allowed, 0.2 for 20%
+    :param min_time: wall times below this many seconds are too noisy to compare
+    :return: a list of strings, one per regression
+    """
+    old_runs = {tuple(result[field] for field in KEY_FIELDS): result for result in old_results}
+    regressions = []
+    for new in new_results:
+        key = tuple(new[field] for field in KEY_FIELDS)
+        if key not in old_runs:
+            continue
+        old = old_runs[key]
+        name = '{}x{} p={} seed={} {} {}'.format(*key)
+        if max(old['wall_time'], new['wall_time']) >= min_time and \
+                new['wall_time'] > old['wall_time'] * (1 + time_tolerance):
+            regressions.append('{}: wall time {:.4f}s -> {:.4f}s'.format(name, old['wall_time'], new['wall_time']))
+        if old['peak_memory'] is not None and new['peak_memory'] is not None and \
+                new['peak_memory'] > old['peak_memory'] * (1 + time_tolerance):
+            regressions.append('{}: peak memory {} -> {} bytes'.format(name, old['peak_memory'], new['peak_memory']))
+        for field in COUNT_FIELDS:
+            # result files written before a counter was added do not have it
+            if old.get(field) is not None and new.get(field) is not None and new[field] > old[field]:
+                regressions.append('{}: {} {} -> {}'.format(name, field.replace('_', ' '), old[field], new[field]))
+        if old['path_length'] != new['path_length']:
+            regressions.append('{}: path length {} -> {}'.format(name, old['path_length'], new['path_length']))
+    return regressions
+
+
+def parse_size(text):
+    rows, _, cols = text.partition('x')
+    return int(rows), int(cols or rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the searches of pathfinding.py on seeded mazes.')
+    commands = parser.add_subparsers(dest='command')
+    run = commands.add_parser('run', help='run the benchmark and write the results to a JSON file')
+    run.add_argument('--sizes', nargs='+', type=parse_size, default=DEFAULT_SIZES,
+                     help='maze sizes as ROWSxCOLS, for example 1000x1000')
+    run.add_argument('--probabilities', nargs='+', type=float, default=DEFAULT_PROBABILITIES)
+    run.add_argument('--methods', nargs='+', choices=sorted(METHODS), default=sorted(METHODS))
+    run.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    run.add_argument('--repeat', type=int, default=3, help='the number of timed runs of every search')
+    run.add_argument('--no-memory', action='store_true', help='skip the second run that measures peak memory')
+    run.add_argument('--output', default='benchmark_results.json')
+    compare = commands.add_parser('compare', help='flag the regressions of a result file against an older one')
+    compare.add_argument('old')
+    compare.add_argument('new')
+    compare.add_argument('--tolerance', type=float, default=0.2,
+                         help='the relative growth of wall time and peak memory that is allowed')
+    arguments = parser.parse_args()
+
+    if arguments.command == 'run':
+        results = run_benchmark(arguments.sizes, arguments.probabilities, arguments.methods, arguments.seed,
+                                arguments.repeat, not arguments.no_memory)
+        print_scaling_curves(results)
+        write_results(results, arguments.output)
+        print('Results written to', arguments.output)
+    elif arguments.command == 'compare':
+        regressions = compare_results(read_results(arguments.old), read_results(arguments.new), arguments.tolerance)
+        for regression in regressions:
+            print(regression)
+        print(len(regressions), 'regressions found')
+        if regressions:
+            sys.exit(1)
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
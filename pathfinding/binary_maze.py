@@ -0,0 +1,130 @@
+import mmap
+import struct
+
+from grid import FlatGrid
+from pathfinding import PathFinding, iter_mazes
+
+# A binary maze file holds any number of mazes:
+#   file header: magic, version, number of mazes, offset of the maze table
+#   maze records, each a maze header followed by the cells of the maze in the padded layout of FlatGrid,
+#   one byte per cell, 0 for blocked and 1 for open, and zero bytes up to a multiple of 8
+#   maze table: the offset of every maze record
+MAGIC = b'PFMZ'
+VERSION = 1
+FILE_HEADER = struct.Struct('<4sHxxIxxxxQ')  # magic, version, number of mazes, offset of the maze table
+MAZE_HEADER = struct.Struct('<IIiiii')  # rows, columns, start row, start column, goal row, goal column
+OFFSET = struct.Struct('<Q')
+
+
+def convert_text_to_binary(text_file_name, binary_file_name):
+    """
+    Converts a text file of mazes, as read by pathfinding.read_file, to a binary maze file.
+    The mazes are converted one at a time.
+    :param text_file_name: the input text file name
+    :param binary_file_name: the output binary file name
+    :return: the number of mazes converted
+    """
+    offsets = []
+    with open(binary_file_name, 'wb') as file:
+        file.write(bytes(FILE_HEADER.size))
+        for maze in iter_mazes(text_file_name):
+            path_finding = PathFinding(maze)
+            grid = path_finding.get_flat_grid()
+            start = path_finding.start_state or (-1, -1)
+            goal = path_finding.goal_state or (-1, -1)
+            offsets.append(file.tell())
+            file.write(MAZE_HEADER.pack(grid.num_rows, grid.num_cols, start[0], start[1], goal[0], goal[1]))
+            file.write(grid.cells)
+            file.write(bytes(-file.tell() % 8))
+        table_offset = file.tell()
+        for offset in offsets:
+            file.write(OFFSET.pack(offset))
+        file.seek(0)
+        file.write(FILE_HEADER.pack(MAGIC, VERSION, len(offsets), table_offset))
+    return len(offsets)
+
+
+class BinaryMazeFile:
+    """
+    A binary maze file mapped into memory. The mazes are read straight from the mapping, so opening a maze takes
+    the same time whatever its size, and processes that open the same file share its pages.
+    """
+
+    def __init__(self, file_name):
+        with open(file_name, 'rb') as file:
+            self.mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.buffer = memoryview(self.mapping)
+        if len(self.buffer) < FILE_HEADER.size:
+            raise ValueError('{} is too short to be a binary maze file'.format(file_name))
+        magic, version, self.num_mazes, self.table_offset = FILE_HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC:
+            raise ValueError('{} is not a binary maze file'.format(file_name))
+        if version != VERSION:
+            raise ValueError('{} has version {}, expected {}'.format(file_name, version, VERSION))
+
+    def __len__(self):
+        return self.num_mazes
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Closes the file. The grids from get_flat_grid are views of the mapping, so while one of them is still in use
+        the mapping stays open for it, and it is unmapped when the last one is dropped.
+        """
+        if self.mapping is None:
+            return
+        self.buffer.release()
+        try:
+            self.mapping.close()
+        except BufferError:
+            pass
+        self.mapping = None
+
+    def get_flat_grid(self, index=0):
+        """
+        :param index: the position of the maze in the file
+        :return: a FlatGrid whose cells are a view of the mapped file
+        """
+        if not 0 <= index < self.num_mazes:
+            raise IndexError('maze {} is not in the file, which has {} mazes'.format(index, self.num_mazes))
+        offset = OFFSET.unpack_from(self.buffer, self.table_offset + index * OFFSET.size)[0]
+        rows, cols, start_row, start_col, goal_row, goal_col = MAZE_HEADER.unpack_from(self.buffer, offset)
+        first_cell = offset + MAZE_HEADER.size
+        cells = self.buffer[first_cell:first_cell + (rows + 2) * (cols + 2)]
+        start = (start_row, start_col) if start_row >= 0 else None
+        goal = (goal_row, goal_col) if goal_row >= 0 else None
+        return FlatGrid.from_buffer(cells, rows, cols, start, goal)
+
+    def get_path_finding(self, index=0):
+        """
+        :param index: the position of the maze in the file
+        :return: a PathFinding that searches the maze in the mapped file without copying it
+        """
+        return PathFinding.from_flat_grid(self.get_flat_grid(index))
+
+
+def open_binary_maze(file_name, index=0):
+    """
+    Opens one maze of a binary maze file for searching.
+    :param file_name: the binary maze file name
+    :param index: the position of the maze in the file
+    :return: a PathFinding over the memory-mapped maze, which keeps the mapping open until it is dropped
+    """
+    with BinaryMazeFile(file_name) as mazes:
+        return mazes.get_path_finding(index)
+
+
+def main():
+    for text_file_name, binary_file_name in [('pathfinding_a.txt', 'pathfinding_a.pfm'),
+                                             ('pathfinding_b.txt', 'pathfinding_b.pfm')]:
+        num_mazes = convert_text_to_binary(text_file_name, binary_file_name)
+        print('Converted', num_mazes, 'mazes from', text_file_name, 'to', binary_file_name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+import heapq
+
+from grid import FlatGrid
+
+INFINITY = float('inf')
+
+
+class DStarLite:
+    """
+    An incremental planner (D* Lite) that keeps its search between calls.
+    The search runs backwards from the goal, so when cells of the maze are opened or blocked only the states whose
+    distance to the goal changes are expanded again, and the start state may move towards the goal in between.
+    """
+
+    def __init__(self, path_finding, diagonal=False):
+        """
+        :param path_finding: the PathFinding of the maze, whose start and goal states are used
+        :param diagonal: True for the maze where you can also move diagonally
+        """
+        # the planner changes cells, so it keeps its own grid instead of sharing the one of path_finding
+        self.grid = FlatGrid(path_finding.maze, path_finding.start_state, path_finding.goal_state)
+        self.offsets = self.grid.diagonal_offsets if diagonal else self.grid.up_down_offsets
+        self.heuristic = self.chebyshev_distance if diagonal else self.manhattan_distance
+        self.start = self.grid.start_index
+        self.last_start = self.start
+        self.goal = self.grid.goal_index
+        self.key_modifier = 0
+        self.g = dict()  # the cost of the goal from each state as of its last expansion
+        self.rhs = {self.goal: 0}  # the cost of the goal from each state looking one move ahead
+        self.frontier = []
+        self.open_keys = dict()  # the key of every state in the frontier, entries with another key are stale
+        self.expansions = 0  # the number of expansions since the planner was created
+        self.last_expansions = 0  # the number of expansions of the last call to compute_shortest_path
+        self.push(self.goal)
+        self.compute_shortest_path()
+
+    def manhattan_distance(self, index_1, index_2):
+        row_1, col_1 = divmod(index_1, self.grid.width)
+        row_2, col_2 = divmod(index_2, self.grid.width)
+        return abs(row_1 - row_2) + abs(col_1 - col_2)
+
+    def chebyshev_distance(self, index_1, index_2):
+        row_1, col_1 = divmod(index_1, self.grid.width)
+        row_2, col_2 = divmod(index_2, self.grid.width)
+        return max(abs(row_1 - row_2), abs(col_1 - col_2))
+
+    def calculate_key(self, index):
+        """
+        :param index: an index of the grid
+        :return: the priority of the state as a pair, compared first by estimated path cost and then by cost to goal
+        """
+        cost = min(self.g.get(index, INFINITY), self.rhs.get(index, INFINITY))
+        return cost + self.heuristic(self.start, index) + self.key_modifier, cost
+
+    def push(self, index):
+        key = self.calculate_key(index)
+        self.open_keys[index] = key
+        heapq.heappush(self.frontier, (key, index))
+
+    def top_key(self):
+        """
+        Drops stale entries from the top of the frontier.
+        :return: the smallest key in the frontier, or (infinity, infinity) if it is empty
+        """
+        while self.frontier:
+            key, index = self.frontier[0]
+            if self.open_keys.get(index) == key:
+                return key
+            heapq.heappop(self.frontier)
+        return INFINITY, INFINITY
+
+    def update_vertex(self, index):
+        """
+        Recomputes the one step lookahead cost of a state and puts it in the frontier if it is inconsistent.
+        """
+        cells = self.grid.cells
+        if index != self.goal:
+            best = INFINITY
+            if cells[index]:
+                for offset in self.offsets:
+                    neighbour = index + offset
+                    if cells[neighbour]:
+                        best = min(best, self.g.get(neighbour, INFINITY) + 1)
+            self.rhs[index] = best
+        self.open_keys.pop(index, None)
+        if self.g.get(index, INFINITY) != self.rhs.get(index, INFINITY):
+            self.push(index)
+
+    def compute_shortest_path(self):
+        """
+        Expands inconsistent states until the cost from the start state to the goal is known.
+        :return: the number of states expanded
+        """
+        expansions = 0
+        while self.top_key() < self.calculate_key(self.start) or \
+                self.rhs.get(self.start, INFINITY) > self.g.get(self.start, INFINITY):
+            old_key, index = heapq.heappop(self.frontier)
+            del self.open_keys[index]
+            new_key = self.calculate_key(index)
+            if old_key < new_key:
+                self.push(index)
+                continue
+            expansions += 1
+            if self.g.get(index, INFINITY) > self.rhs[index]:
+                self.g[index] = self.rhs[index]
+                for offset in self.offsets:
+                    self.update_vertex(index + offset)
+            else:
+                self.g[index] = INFINITY
+                self.update_vertex(index)
+                for offset in self.offsets:
+                    self.update_vertex(index + offset)
+        self.last_expansions = expansions
+        self.expansions += expansions
+        return expansions
+
+    def move_start(self, state):
+        """
+        Moves the start state, for example after the agent has made some moves along the path.
+        :param state: an ordered pair as a tuple (x, y), the new start state
+        """
+        self.start = self.grid.index(state)
+
+    def update_cells(self, changes):
+        """
+        Opens or blocks a batch of cells and repairs the shortest path.
+        :param changes: an iterable of (state, value) where value is the new character of the cell, '_' or 'X'
+        :return: the number of states expanded to repair the path
+        """
+        self.key_modifier += self.heuristic(self.last_start, self.start)
+        self.last_start = self.start
+        for state, value in changes:
+            index = self.grid.index(state)
+            is_open = value == '_' or value == 'S' or value == 'G'
+            if bool(self.grid.cells[index]) == is_open:
+                continue
+            self.grid.set_open(index, is_open)
+            # every edge into and out of the cell changed cost
+            self.update_vertex(index)
+            for offset in self.offsets:
+                self.update_vertex(index + offset)
+        return self.compute_shortest_path()
+
+    def path_cost(self):
+        """
+        :return: the number of moves on a shortest path from the start state to the goal, infinity if there is none
+        """
+        # the start state may stay locally inconsistent with g above rhs, and then rhs holds its cost
+        return self.rhs.get(self.start, INFINITY)
+
+    def get_path_map(self):
+        """
+        Find the current shortest path by moving from the start state to the neighbour with the smallest cost to goal.
+        :return: a map from states on the path to their previous state, as used by PathFinding.get_result_maze
+        """
+        came_from = {self.start: None}
+        if self.path_cost() == INFINITY:
+            return self.grid.to_state_map(came_from)
+        cells = self.grid.cells
+        current = self.start
+        while current != self.goal:
+            best = None
+            best_cost = INFINITY
+            for offset in self.offsets:
+                neighbour = current + offset
+                if cells[neighbour] and self.g.get(neighbour, INFINITY) < best_cost:
+                    best = neighbour
+                    best_cost = self.g[neighbour]
+            came_from[best] = current
+            current = best
+        return self.grid.to_state_map(came_from)
@@ -0,0 +1,357 @@
+from array import array
+from collections import OrderedDict
+import hashlib
+
+BLOCKED = 0
+OPEN = 1
+
+# maps every character of a maze row to BLOCKED or OPEN
+_CELL_TABLE = bytes(OPEN if chr(i) in '_SG' else BLOCKED for i in range(256))
+
+
+class LRUCache:
+    """
+    A map that holds at most max_size entries and drops the least recently used entry when it is full.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        """
+        :param key: the key to look up
+        :return: the value stored for key, or None if there is none
+        """
+        if key not in self.entries:
+            return None
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key, value):
+        """
+        Stores value for key, dropping the least recently used entry if the cache is full.
+        :param key: the key to store value under
+        :param value: the value to store
+        """
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class FlatGrid:
+    """
+    A compact representation of a maze as a single bytearray.
+    Every cell is addressed by one integer index instead of a (row, column) tuple, and the grid is padded
+    with a border of blocked cells so that neighbours can be found by adding precomputed offsets
+    without any bounds checks.
+    """
+
+    def __init__(self, maze, start_state, goal_state):
+        num_rows = len(maze)
+        num_cols = max(len(row) for row in maze) if maze else 0
+        # one extra column on each side for the blocked border
+        width = num_cols + 2
+        cells = bytearray(width * (num_rows + 2))
+        for i in range(num_rows):
+            row = ''.join(maze[i]).encode('latin-1', 'replace').translate(_CELL_TABLE)
+            base = (i + 1) * width + 1
+            cells[base:base + len(row)] = row
+        self.set_cells(cells, num_rows, num_cols, start_state, goal_state)
+
+    @classmethod
+    def from_buffer(cls, cells, num_rows, num_cols, start_state, goal_state):
+        """
+        Creates a grid over cells that are already in the padded layout of FlatGrid, without copying them.
+        :param cells: a buffer of (num_rows + 2) * (num_cols + 2) bytes, such as a memoryview of a memory-mapped file
+        :param num_rows: the number of rows of the maze
+        :param num_cols: the number of columns of the maze
+        :param start_state: the start state (x, y), or None
+        :param goal_state: the goal state (x, y), or None
+        :return: the FlatGrid
+        """
+        grid = cls.__new__(cls)
+        grid.set_cells(cells, num_rows, num_cols, start_state, goal_state)
+        return grid
+
+    def with_endpoints(self, start_state, goal_state):
+        """
+        Creates a grid over the same cells with another start and goal, without copying the cells.
+        :param start_state: the start state (x, y)
+        :param goal_state: the goal state (x, y)
+        :return: the FlatGrid
+        """
+        grid = FlatGrid.from_buffer(self.cells, self.num_rows, self.num_cols, start_state, goal_state)
+        grid.hash = self.hash  # the hash only depends on the cells
+        return grid
+
+    def set_cells(self, cells, num_rows, num_cols, start_state, goal_state):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.width = num_cols + 2
+        self.cells = cells
+        self.up_down_offsets = (-self.width,  # left
+                                self.width,  # right
+                                -1,  # up
+                                1)  # down
+        self.diagonal_offsets = self.up_down_offsets + (-self.width - 1,  # top left
+                                                        -self.width + 1,  # top right
+                                                        self.width - 1,  # bottom left
+                                                        self.width + 1)  # bottom right
+        self.start_index = self.index(start_state) if start_state is not None else None
+        self.goal_index = self.index(goal_state) if goal_state is not None else None
+        self.hash = None
+
+    def content_hash(self):
+        """
+        Computes a hash of the open and blocked cells of the grid, which identifies the maze in caches
+        shared between PathFinding instances.
+        :return: a bytes digest of the grid
+        """
+        if self.hash is None:
+            digest = hashlib.blake2b(self.cells, digest_size=16)
+            digest.update(self.width.to_bytes(4, 'little'))
+            self.hash = digest.digest()
+        return self.hash
+
+    def set_open(self, index, is_open):
+        """
+        Opens or blocks the cell at the given index.
+        :param index: an index in self.cells
+        :param is_open: True to open the cell, False to block it
+        """
+        self.cells[index] = OPEN if is_open else BLOCKED
+        self.hash = None
+
+    def index(self, state):
+        """
+        Converts a state (x, y) of the maze to its index in the flat grid.
+        :param state: an ordered pair as a tuple (x, y)
+        :return: the index of the state in self.cells
+        """
+        return (state[0] + 1) * self.width + state[1] + 1
+
+    def state(self, index):
+        """
+        Converts an index in the flat grid back to a state (x, y) of the maze.
+        :param index: an index in self.cells
+        :return: an ordered pair as a tuple (x, y)
+        """
+        row, col = divmod(index, self.width)
+        return row - 1, col - 1
+
+    def to_state_map(self, came_from):
+        """
+        Converts a map from indices to their previous index into a map from states to their previous state,
+        which is the format used by PathFinding.get_result_maze.
+        :param came_from: a map from indices to their previous index
+        :return: a map from states to their previous state
+        """
+        state = self.state
+        return {state(index): None if previous is None else state(previous)
+                for index, previous in came_from.items()}
+
+    def manhattan_heuristic(self, index):
+        """
+        Calculates the Manhattan distance between the cell at the given index and the goal.
+        :param index: an index in self.cells
+        :return: the Manhattan heuristic of the cell
+        """
+        row, col = divmod(index, self.width)
+        goal_row, goal_col = divmod(self.goal_index, self.width)
+        return abs(row - goal_row) + abs(col - goal_col)
+
+    def chebyshev_heuristic(self, index):
+        """
+        Calculates the Chebyshev distance between the cell at the given index and the goal.
+        :param index: an index in self.cells
+        :return: the Chebyshev heuristic of the cell
+        """
+        row, col = divmod(index, self.width)
+        goal_row, goal_col = divmod(self.goal_index, self.width)
+        return max(abs(row - goal_row), abs(col - goal_col))
+
+    def greedy_search(self, offsets, heuristic, frontier, stats=None):
+        """
+        Greedy search from start to goal over the flat grid.
+        Neighbours are visited in the order of offsets and, with a HeapOpenList, ties are broken by the smaller index,
+        which gives the same paths as the greedy searches of PathFinding.
+        :param offsets: the neighbour offsets of the movement model
+        :param heuristic: a function from an index to its heuristic value
+        :param frontier: an empty open list, see open_list.py
+        :param stats: a SearchStats to collect the counters and timings of the search, or None; neighbours are
+                      generated inline, so only the heuristic is timed
+        :return: a map from indices to their previous index
+        """
+        if stats is not None:
+            heuristic = stats.timed_heuristic(heuristic)
+            stats.start()
+        cells = self.cells
+        goal = self.goal_index
+        frontier.push(0, 0, self.start_index)
+        if stats is not None:
+            stats.push(self.start_index, 0, len(frontier))
+        came_from = {self.start_index: None}
+
+        while len(frontier) > 0:
+            current = frontier.pop()[2]
+            if stats is not None:
+                stats.expand(current)
+            if current == goal:
+                break
+            for offset in offsets:
+                neighbour = current + offset
+                if cells[neighbour] and neighbour not in came_from:
+                    priority = heuristic(neighbour)
+                    frontier.push(priority, 0, neighbour)
+                    came_from[neighbour] = current
+                    if stats is not None:
+                        stats.push(neighbour, priority, len(frontier))
+        if stats is not None:
+            stats.stop()
+        return came_from
+
+    def a_star_search(self, offsets, heuristic, frontier, stats=None):
+        """
+        A* search from start to goal over the flat grid where every move costs 1.
+        Neighbours are visited in the order of offsets and, with a HeapOpenList, ties are broken by the smaller index,
+        which gives the same paths as the A* searches of PathFinding. Stale entries are skipped.
+        :param offsets: the neighbour offsets of the movement model
+        :param heuristic: a function from an index to its heuristic value
+        :param frontier: an empty open list, see open_list.py
+        :param stats: a SearchStats to collect the counters and timings of the search, or None; neighbours are
+                      generated inline, so only the heuristic is timed
+        :return: a map from indices to their previous index
+        """
+        if stats is not None:
+            heuristic = stats.timed_heuristic(heuristic)
+            stats.start()
+        cells = self.cells
+        goal = self.goal_index
+        frontier.push(0, 0, self.start_index)
+        if stats is not None:
+            stats.push(self.start_index, 0, len(frontier))
+        came_from = {self.start_index: None}
+        cost_so_far = {self.start_index: 0}
+
+        while len(frontier) > 0:
+            priority, cost, current = frontier.pop()
+            if cost > cost_so_far[current]:
+                if stats is not None:
+                    stats.stale_pop()
+                continue
+            if stats is not None:
+                stats.expand(current)
+            if current == goal:
+                break
+            new_cost = cost + 1
+            for offset in offsets:
+                neighbour = current + offset
+                if cells[neighbour] and (neighbour not in cost_so_far or new_cost < cost_so_far[neighbour]):
+                    cost_so_far[neighbour] = new_cost
+                    priority = new_cost + heuristic(neighbour)
+                    frontier.push(priority, new_cost, neighbour)
+                    came_from[neighbour] = current
+                    if stats is not None:
+                        stats.push(neighbour, priority, len(frontier))
+        if stats is not None:
+            stats.stop()
+        return came_from
+
+    def label_components(self, offsets):
+        """
+        Labels the connected components of the open cells in a single pass over the grid.
+        Each open cell that has no label yet starts a flood fill that gives the next label to every cell reachable
+        from it, so every cell is labelled exactly once.
+        :param offsets: the neighbour offsets of the movement model
+        :return: an array with the component label of every index, 0 for blocked cells
+        """
+        cells = self.cells
+        labels = array('i', bytes(4 * len(cells)))
+        num_labels = 0
+        for index in range(len(cells)):
+            if not cells[index] or labels[index]:
+                continue
+            num_labels += 1
+            labels[index] = num_labels
+            stack = [index]
+            while stack:
+                current = stack.pop()
+                for offset in offsets:
+                    neighbour = current + offset
+                    if cells[neighbour] and not labels[neighbour]:
+                        labels[neighbour] = num_labels
+                        stack.append(neighbour)
+        return labels
+
+    def distance_field(self, root, offsets):
+        """
+        Finds the distance from every cell to root with a breadth first search from root.
+        Since every move costs 1, the breadth first search visits the cells in order of their distance.
+        :param root: the index the distances are measured to
+        :param offsets: the neighbour offsets of the movement model
+        :return: a pair of arrays (distances, next_steps) where distances[i] is the number of moves from i to root
+                 and next_steps[i] is the next index on a shortest path from i to root, both -1 when root cannot
+                 be reached from i
+        """
+        cells = self.cells
+        distances = array('i', [-1]) * len(cells)
+        next_steps = array('i', [-1]) * len(cells)
+        distances[root] = 0
+        wave = [root]
+        distance = 0
+        while wave:
+            distance += 1
+            next_wave = []
+            for current in wave:
+                for offset in offsets:
+                    neighbour = current + offset
+                    if cells[neighbour] and distances[neighbour] < 0:
+                        distances[neighbour] = distance
+                        next_steps[neighbour] = current
+                        next_wave.append(neighbour)
+            wave = next_wave
+        return distances, next_steps
+
+
+class MazeView:
+    """
+    A read-only view of a FlatGrid that can be indexed like the 2D list of a maze, maze[x][y], without copying
+    the grid. Positions outside the maze read as 'X', like the border of the grid.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+
+    def __len__(self):
+        return self.grid.num_rows
+
+    def __getitem__(self, row):
+        if row >= self.grid.num_rows:
+            raise IndexError('row {} is outside the maze'.format(row))
+        return MazeRowView(self.grid, row)
+
+
+class MazeRowView:
+    def __init__(self, grid, row):
+        self.grid = grid
+        self.row = row
+
+    def __len__(self):
+        return self.grid.num_cols
+
+    def __getitem__(self, col):
+        if col >= self.grid.num_cols:
+            raise IndexError('column {} is outside the maze'.format(col))
+        index = self.grid.index((self.row, col))
+        if index < 0 or index >= len(self.grid.cells) or not self.grid.cells[index]:
+            return 'X'
+        if index == self.grid.start_index:
+            return 'S'
+        if index == self.grid.goal_index:
+            return 'G'
+        return '_'
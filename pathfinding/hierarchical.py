@@ -0,0 +1,213 @@
+from array import array
+import heapq
+
+from grid import LRUCache
+
+# abstract graphs keyed by maze content, cluster size and movement model, shared by all mazes with the same content
+abstract_graphs = LRUCache(8)
+
+
+class AbstractGraph:
+    """
+    The abstraction of a maze used by hierarchical pathfinding (HPA*).
+    The maze is split into square clusters of cluster_size by cluster_size cells. Wherever open cells of two
+    neighbouring clusters touch, the touching cells are grouped into entrances and one pair of cells per entrance
+    becomes a pair of abstract nodes. Abstract nodes are joined by an edge of cost 1 across the border of the
+    clusters and by an edge of their shortest distance within the cluster to the other abstract nodes of the cluster.
+    """
+
+    def __init__(self, grid, cluster_size, offsets):
+        self.grid = grid
+        self.cluster_size = cluster_size
+        self.offsets = offsets
+        # the cluster number of every index, so that the cluster of a cell is a single lookup
+        self.cluster_ids = array('i', [-1]) * len(grid.cells)
+        clusters_per_row = (grid.num_cols + cluster_size - 1) // cluster_size
+        for row in range(grid.num_rows):
+            base = (row + 1) * grid.width + 1
+            for col in range(grid.num_cols):
+                self.cluster_ids[base + col] = (row // cluster_size) * clusters_per_row + col // cluster_size
+        self.edges = dict()  # a map from an abstract node to a list of (abstract node, cost)
+        self.cluster_nodes = dict()  # a map from a cluster to the abstract nodes in it
+        self.add_entrances()
+        for nodes in self.cluster_nodes.values():
+            targets = set(nodes)
+            for node in nodes:
+                distances = self.cluster_search(node, targets)[0]
+                for other in nodes:
+                    if other != node and other in distances:
+                        self.edges[node].append((other, distances[other]))
+
+    def cluster_of(self, index):
+        """
+        :param index: an index of the flat grid
+        :return: the number of the cluster of the index, -1 for the border of the grid
+        """
+        return self.cluster_ids[index]
+
+    def is_adjacent(self, index_1, index_2):
+        """
+        :return: True if the two indices are equal or one move apart in the movement model
+        """
+        return index_1 == index_2 or (index_2 - index_1) in self.offsets
+
+    def add_entrances(self):
+        """
+        Finds every pair of neighbouring open cells in different clusters and groups them into entrances, that is,
+        runs of pairs whose cells are next to the cells of the previous pair on both sides. The middle pair of
+        every entrance becomes a pair of abstract nodes.
+        """
+        cells = self.grid.cells
+        cluster_ids = self.cluster_ids
+        forward_offsets = [offset for offset in self.offsets if offset > 0]
+        transitions = dict()  # a map from a pair of clusters to the pairs of cells between them
+        for index in range(len(cells)):
+            if not cells[index]:
+                continue
+            cluster = cluster_ids[index]
+            for offset in forward_offsets:
+                neighbour = index + offset
+                if cells[neighbour] and cluster_ids[neighbour] != cluster:
+                    transitions.setdefault((cluster, cluster_ids[neighbour]), []).append((index, neighbour))
+
+        for pairs in transitions.values():
+            pairs.sort()
+            entrance = [pairs[0]]
+            for pair in pairs[1:]:
+                previous = entrance[-1]
+                if self.is_adjacent(previous[0], pair[0]) and self.is_adjacent(previous[1], pair[1]):
+                    entrance.append(pair)
+                else:
+                    self.add_abstract_edge(entrance[len(entrance) // 2])
+                    entrance = [pair]
+            self.add_abstract_edge(entrance[len(entrance) // 2])
+
+    def add_abstract_edge(self, pair):
+        """
+        Adds both cells of a pair of neighbouring cells in different clusters as abstract nodes joined by an edge.
+        :param pair: a pair of indices (index_1, index_2)
+        """
+        for node, other in (pair, pair[::-1]):
+            if node not in self.edges:
+                self.edges[node] = []
+                self.cluster_nodes.setdefault(self.cluster_of(node), []).append(node)
+            self.edges[node].append((other, 1))
+
+    def cluster_search(self, root, targets=None):
+        """
+        Breadth first search from root that never leaves the cluster of root.
+        :param root: an index of the flat grid
+        :param targets: if given, a set of indices, and the search stops as soon as all of them have been reached
+        :return: a pair of maps (distances, came_from) from the indices reached to their distance from root and to
+                 their previous index
+        """
+        cells = self.grid.cells
+        cluster_ids = self.cluster_ids
+        cluster = cluster_ids[root]
+        distances = {root: 0}
+        came_from = {root: None}
+        wave = [root]
+        distance = 0
+        remaining = len(targets) - (root in targets) if targets is not None else -1
+        while wave and remaining != 0:
+            distance += 1
+            next_wave = []
+            for current in wave:
+                for offset in self.offsets:
+                    neighbour = current + offset
+                    if cells[neighbour] and cluster_ids[neighbour] == cluster and neighbour not in distances:
+                        distances[neighbour] = distance
+                        came_from[neighbour] = current
+                        next_wave.append(neighbour)
+                        if targets is not None and neighbour in targets:
+                            remaining -= 1
+            wave = next_wave
+        return distances, came_from
+
+    def search(self, start, goal, heuristic, stats=None):
+        """
+        Find a path from start to goal by searching the abstract graph and then refining every abstract edge on the
+        path into cells. Start and goal are connected to the abstract nodes of their clusters for this search only.
+        :param start: the index to start from
+        :param goal: the index to reach
+        :param heuristic: a function from an index to its heuristic value towards goal
+        :param stats: a SearchStats to collect the counters and timings of the abstract search, or None; connecting
+                      start and goal to their clusters is counted as neighbour generation
+        :return: a map from indices on the path to their previous index, which only contains start if there is no path
+        """
+        cluster_search = self.cluster_search
+        if stats is not None:
+            cluster_search = stats.timed_neighbours(cluster_search)
+            heuristic = stats.timed_heuristic(heuristic)
+            stats.start()
+        start_distances = cluster_search(start)[0]
+        goal_distances = cluster_search(goal)[0]
+        start_edges = [(node, start_distances[node])
+                       for node in self.cluster_nodes.get(self.cluster_of(start), []) if node in start_distances]
+        if goal in start_distances:
+            start_edges.append((goal, start_distances[goal]))
+        goal_edges = {node: goal_distances[node]
+                      for node in self.cluster_nodes.get(self.cluster_of(goal), []) if node in goal_distances}
+
+        frontier = [(heuristic(start), start)]
+        if stats is not None:
+            stats.push(start, frontier[0][0], 1)
+        abstract_came_from = {start: None}
+        cost_so_far = {start: 0}
+        while frontier:
+            priority, current = heapq.heappop(frontier)
+            if stats is not None:
+                if priority - heuristic(current) > cost_so_far[current]:
+                    stats.stale_pop()
+                else:
+                    stats.expand(current)
+            if current == goal:
+                break
+            edges = self.edges.get(current, [])
+            if current == start:
+                edges = start_edges + edges
+            if current in goal_edges:
+                edges = edges + [(goal, goal_edges[current])]
+            for next_node, cost in edges:
+                new_cost = cost_so_far[current] + cost
+                if next_node not in cost_so_far or new_cost < cost_so_far[next_node]:
+                    cost_so_far[next_node] = new_cost
+                    priority = new_cost + heuristic(next_node)
+                    heapq.heappush(frontier, (priority, next_node))
+                    abstract_came_from[next_node] = current
+                    if stats is not None:
+                        stats.push(next_node, priority, len(frontier))
+
+        came_from = {start: None}
+        if goal not in abstract_came_from:
+            return came_from
+        abstract_path = [goal]
+        while abstract_came_from[abstract_path[-1]] is not None:
+            abstract_path.append(abstract_came_from[abstract_path[-1]])
+        abstract_path.reverse()
+        for current, next_node in zip(abstract_path, abstract_path[1:]):
+            if self.cluster_of(current) != self.cluster_of(next_node):
+                came_from[next_node] = current
+                continue
+            refined = self.cluster_search(current, {next_node})[1]
+            node = next_node
+            while node != current:
+                came_from[node] = refined[node]
+                node = refined[node]
+        return came_from
+
+
+def get_abstract_graph(grid, cluster_size, diagonal):
+    """
+    Finds the abstract graph of a maze in the abstract_graphs cache, building it if it is not there.
+    :param grid: the FlatGrid of the maze
+    :param cluster_size: the number of rows and columns of a cluster
+    :param diagonal: True for the maze where you can also move diagonally
+    :return: the AbstractGraph of the maze
+    """
+    key = (grid.content_hash(), cluster_size, diagonal)
+    graph = abstract_graphs.get(key)
+    if graph is None:
+        graph = AbstractGraph(grid, cluster_size, grid.diagonal_offsets if diagonal else grid.up_down_offsets)
+        abstract_graphs.put(key, graph)
+    return graph
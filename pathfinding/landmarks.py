@@ -0,0 +1,147 @@
+from array import array
+import random
+
+from grid import LRUCache
+
+STRATEGIES = ('corners', 'farthest', 'random')
+
+# landmark tables keyed by maze content, movement model, number of landmarks, strategy and seed
+landmark_tables = LRUCache(8)
+
+
+class LandmarkTables:
+    """
+    The exact distances from a few landmark cells to every cell of a maze, used for the ALT heuristic of A*.
+    Since every move costs 1 and can be made in both directions, the triangle inequality gives for every landmark L
+    and every pair of cells v and goal in the component of L:
+        distance(v, goal) >= |distance(L, goal) - distance(L, v)|
+    so the largest of these bounds is an admissible and consistent heuristic, which unlike the Manhattan and
+    Chebyshev distances takes the walls into account.
+    """
+
+    def __init__(self, landmarks, distances):
+        """
+        :param landmarks: a list of indices of the flat grid
+        :param distances: for every landmark, an array of the distance from every index to it, -1 for the indices
+                          that cannot reach it, see FlatGrid.distance_field
+        """
+        self.landmarks = landmarks
+        # tables are stored in 2 bytes per cell when their distances fit
+        self.tables = [array('h', table) if max(table) <= 0x7fff else table for table in distances]
+
+    def make_heuristic(self, goal, geometric_heuristic):
+        """
+        :param goal: the index of the goal in the flat grid
+        :param geometric_heuristic: the Manhattan or Chebyshev heuristic of the flat grid towards goal
+        :return: a function from an index to the largest of the landmark bounds and the geometric heuristic
+        """
+        # a landmark that cannot reach the goal says nothing about the distance to the goal
+        goal_tables = [(table, table[goal]) for table in self.tables if table[goal] >= 0]
+
+        def heuristic(index):
+            best = geometric_heuristic(index)
+            for table, goal_distance in goal_tables:
+                distance = table[index]
+                if distance >= 0:
+                    bound = distance - goal_distance if distance > goal_distance else goal_distance - distance
+                    if bound > best:
+                        best = bound
+            return best
+        return heuristic
+
+
+def find_open_cell_near(grid, row, col):
+    """
+    Finds the open cell closest to a position of the maze, searching squares of growing size around it.
+    :param grid: the FlatGrid of the maze
+    :param row: the row of the position
+    :param col: the column of the position
+    :return: the index of the open cell, or None if the maze has no open cell
+    """
+    for radius in range(max(grid.num_rows, grid.num_cols)):
+        for r in range(max(0, row - radius), min(grid.num_rows, row + radius + 1)):
+            for c in range(max(0, col - radius), min(grid.num_cols, col + radius + 1)):
+                if max(abs(r - row), abs(c - col)) == radius and grid.cells[grid.index((r, c))]:
+                    return grid.index((r, c))
+    return None
+
+
+def select_corner_landmarks(grid, num_landmarks):
+    """
+    Places landmarks at the open cells closest to the corners of the maze, then to the middles of its sides.
+    :return: a list of indices of the flat grid
+    """
+    last_row, last_col = grid.num_rows - 1, grid.num_cols - 1
+    positions = [(0, 0), (last_row, last_col), (0, last_col), (last_row, 0),
+                 (0, last_col // 2), (last_row, last_col // 2), (last_row // 2, 0), (last_row // 2, last_col)]
+    landmarks = []
+    for row, col in positions:
+        index = find_open_cell_near(grid, row, col)
+        if index is not None and index not in landmarks:
+            landmarks.append(index)
+        if len(landmarks) == num_landmarks:
+            break
+    return landmarks
+
+
+def select_farthest_landmarks(grid, num_landmarks, offsets):
+    """
+    Places landmarks by farthest point sampling: the first landmark is the open cell closest to the top left corner,
+    and every next landmark is the cell farthest from the landmarks chosen so far. All landmarks are in the
+    component of the first one.
+    :return: a pair (landmarks, distances) of a list of indices of the flat grid and the distance fields of the
+             landmarks, which the sampling computes anyway
+    """
+    first = find_open_cell_near(grid, 0, 0)
+    if first is None:
+        return [], []
+    landmarks = [first]
+    distances = [grid.distance_field(first, offsets)[0]]
+    closest = distances[0]  # the distance of every cell to its closest landmark
+    while len(landmarks) < num_landmarks:
+        largest = max(closest)
+        if largest <= 0:
+            break
+        landmarks.append(closest.index(largest))
+        distances.append(grid.distance_field(landmarks[-1], offsets)[0])
+        # the cells outside the component of the first landmark are -1 in every field, so min keeps them -1
+        closest = array('i', map(min, closest, distances[-1]))
+    return landmarks, distances
+
+
+def select_random_landmarks(grid, num_landmarks, seed):
+    """
+    Places landmarks at random open cells.
+    :return: a list of indices of the flat grid
+    """
+    open_cells = [index for index in range(len(grid.cells)) if grid.cells[index]]
+    return random.Random(seed).sample(open_cells, min(num_landmarks, len(open_cells)))
+
+
+def get_landmark_tables(grid, diagonal, num_landmarks=8, strategy='corners', seed=0):
+    """
+    Finds the landmark tables of a maze in the landmark_tables cache, building them if they are not there.
+    :param grid: the FlatGrid of the maze
+    :param diagonal: True for the maze where you can also move diagonally
+    :param num_landmarks: the largest number of landmarks to place
+    :param strategy: how to place the landmarks, one of STRATEGIES
+    :param seed: the seed of the random strategy
+    :return: the LandmarkTables of the maze
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError('unknown landmark strategy {}, expected one of {}'.format(strategy, STRATEGIES))
+    key = (grid.content_hash(), diagonal, num_landmarks, strategy, seed)
+    tables = landmark_tables.get(key)
+    if tables is None:
+        offsets = grid.diagonal_offsets if diagonal else grid.up_down_offsets
+        if strategy == 'farthest':
+            landmarks, distances = select_farthest_landmarks(grid, num_landmarks, offsets)
+        else:
+            if strategy == 'corners':
+                landmarks = select_corner_landmarks(grid, num_landmarks)
+            else:
+                landmarks = select_random_landmarks(grid, num_landmarks, seed)
+            distances = [grid.distance_field(landmark, offsets)[0] for landmark in landmarks]
+        tables = LandmarkTables(landmarks, distances)
+        landmark_tables.put(key, tables)
+    return tables
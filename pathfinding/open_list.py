@@ -0,0 +1,165 @@
+import heapq
+
+
+class HeapOpenList:
+    """
+    The open list used by the searches of PathFinding: a binary heap of (priority, state) entries.
+    Ties between equal priorities are broken by the smaller state and not by the larger cost like the other open
+    lists. This is deliberate: it is the order of the original searches, so their paths and outputs do not change.
+    Every open list has push(priority, cost, state), pop() -> (priority, cost, state) and counts its pushes and pops.
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.push_count = 0
+        self.pop_count = 0
+
+    def push(self, priority, cost, state):
+        """
+        Adds a state to the open list.
+        :param priority: the priority of the state, smaller priorities are popped first
+        :param cost: the cost of the path to the state
+        :param state: the state
+        """
+        self.push_count += 1
+        # (priority, state) never repeats, so the cost at the end never takes part in the ordering
+        heapq.heappush(self.heap, (priority, state, cost))
+
+    def pop(self):
+        """
+        Removes the entry with the smallest priority from the open list.
+        :return: the entry as a tuple (priority, cost, state)
+        """
+        self.pop_count += 1
+        priority, state, cost = heapq.heappop(self.heap)
+        return priority, cost, state
+
+    def __len__(self):
+        return len(self.heap)
+
+
+class CostBucket:
+    """
+    The states that share one priority, popped in order of larger cost first, and last in first out on equal costs.
+    """
+
+    def __init__(self):
+        self.stacks = dict()  # a map from a cost to the states pushed with it
+        self.costs = []  # a heap of the negated costs that have states
+        self.size = 0
+
+    def push(self, cost, state):
+        if cost not in self.stacks:
+            self.stacks[cost] = []
+            heapq.heappush(self.costs, -cost)
+        self.stacks[cost].append(state)
+        self.size += 1
+
+    def pop(self):
+        """
+        :return: a pair (cost, state) with the largest cost in the bucket
+        """
+        cost = -self.costs[0]
+        stack = self.stacks[cost]
+        state = stack.pop()
+        if not stack:
+            del self.stacks[cost]
+            heapq.heappop(self.costs)
+        self.size -= 1
+        return cost, state
+
+    def __len__(self):
+        return self.size
+
+
+class BucketOpenList:
+    """
+    A bucket queue for non-negative integer priorities (Dial's algorithm).
+    There is one bucket per priority, and the search for the next entry starts at the smallest priority that can be
+    non-empty, so pushes are constant time and pops move forward over the buckets. Within a bucket the entry with the
+    larger cost is popped first.
+    """
+
+    def __init__(self):
+        self.buckets = []
+        self.smallest = 0  # no bucket before this one has entries
+        self.size = 0
+        self.push_count = 0
+        self.pop_count = 0
+
+    def push(self, priority, cost, state):
+        self.push_count += 1
+        while len(self.buckets) <= priority:
+            self.buckets.append(None)
+        if self.buckets[priority] is None:
+            self.buckets[priority] = CostBucket()
+        self.buckets[priority].push(cost, state)
+        if priority < self.smallest:
+            self.smallest = priority
+        self.size += 1
+
+    def pop(self):
+        self.pop_count += 1
+        while self.buckets[self.smallest] is None or len(self.buckets[self.smallest]) == 0:
+            self.smallest += 1
+        priority = self.smallest
+        cost, state = self.buckets[priority].pop()
+        self.size -= 1
+        return priority, cost, state
+
+    def __len__(self):
+        return self.size
+
+
+class RadixHeapOpenList:
+    """
+    A radix heap for non-negative integer priorities that never drop below the last popped priority, which holds
+    for A* with a consistent heuristic but not for greedy search.
+    Bucket i > 0 holds the priorities whose highest bit that differs from the last popped priority is bit i - 1,
+    so every entry moves to a lower bucket at most once per bit. The entries with the last popped priority are kept
+    in a CostBucket so the entry with the larger cost is popped first.
+    PathFinding gives greedy searches a BucketOpenList instead, see monotone.
+    """
+
+    # True for the open lists that need priorities that never drop below the last popped priority
+    monotone = True
+
+    def __init__(self):
+        self.last = 0
+        self.top = CostBucket()
+        self.buckets = [[] for _ in range(65)]
+        self.size = 0
+        self.push_count = 0
+        self.pop_count = 0
+
+    def push(self, priority, cost, state):
+        if priority < self.last:
+            raise ValueError('a radix heap needs priorities that do not decrease, got {} after {}'.format(
+                priority, self.last))
+        self.push_count += 1
+        if priority == self.last:
+            self.top.push(cost, state)
+        else:
+            self.buckets[(priority ^ self.last).bit_length()].append((priority, cost, state))
+        self.size += 1
+
+    def pop(self):
+        self.pop_count += 1
+        if len(self.top) == 0:
+            i = 1
+            while not self.buckets[i]:
+                i += 1
+            entries = self.buckets[i]
+            self.buckets[i] = []
+            self.last = min(entry[0] for entry in entries)
+            for priority, cost, state in entries:
+                if priority == self.last:
+                    self.top.push(cost, state)
+                else:
+                    self.buckets[(priority ^ self.last).bit_length()].append((priority, cost, state))
+        cost, state = self.top.pop()
+        self.size -= 1
+        return self.last, cost, state
+
+    def __len__(self):
+        return self.size
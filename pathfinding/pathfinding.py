@@ -1,14 +1,75 @@
-import copy
+from array import array
 import heapq
 import time
 
+from grid import FlatGrid, LRUCache, MazeView
+from hierarchical import get_abstract_graph
+from landmarks import get_landmark_tables
+from open_list import BucketOpenList, HeapOpenList
+
+# distance fields rooted at a goal, shared by all PathFinding instances and keyed by maze content and goal
+distance_fields = LRUCache(16)
+# component labels, shared by all PathFinding instances and keyed by maze content and movement model
+component_label_arrays = LRUCache(16)
+
+
+class SearchPath:
+    """
+    A path from the start state to the goal state stored as a flat array of coordinates x_1, y_1, x_2, y_2, ...
+    """
+
+    def __init__(self, coordinates):
+        self.coordinates = coordinates
+        self.length = len(coordinates) // 2  # the number of states on the path
+        self.cost = self.length - 1  # the number of moves, each of which costs 1
+
+    def states(self):
+        """
+        :return: a generator of the states on the path as tuples (x, y), from the start state to the goal state
+        """
+        coordinates = self.coordinates
+        for i in range(0, len(coordinates), 2):
+            yield coordinates[i], coordinates[i + 1]
+
 
 class PathFinding:
-    def __init__(self, maze):
+    def __init__(self, maze, flat_grid=False, open_list=HeapOpenList):
         self.maze = maze
         self.start_state = None  # represented by an ordered pair (x, y) as a tuple
         self.goal_state = None
         self.initialize_start_goal_states()
+        # when flat_grid is True the searches run on a FlatGrid instead of the nested lists of self.maze
+        self.use_flat_grid = flat_grid
+        self.flat_grid = None
+        self.initialize_search_state(open_list)
+
+    @classmethod
+    def from_flat_grid(cls, grid, open_list=HeapOpenList):
+        """
+        Creates a PathFinding over an existing FlatGrid, for example one loaded from a binary maze file, without
+        copying the grid. The searches run on the grid and self.maze is a read-only MazeView of it.
+        :param grid: the FlatGrid of the maze
+        :param open_list: the open list class of the greedy and A* searches
+        :return: the PathFinding
+        """
+        path_finding = cls.__new__(cls)
+        path_finding.maze = MazeView(grid)
+        path_finding.start_state = grid.state(grid.start_index) if grid.start_index is not None else None
+        path_finding.goal_state = grid.state(grid.goal_index) if grid.goal_index is not None else None
+        path_finding.use_flat_grid = True
+        path_finding.flat_grid = grid
+        path_finding.initialize_search_state(open_list)
+        return path_finding
+
+    def initialize_search_state(self, open_list):
+        # the open list class of the greedy and A* searches, and the open list of the last search
+        self.open_list_class = open_list
+        self.open_list = None
+        # component labels of the flat grid for each movement model, built by label_components
+        self.component_labels = dict()
+        # the number of nodes expanded in each direction by the last bidirectional search
+        self.nodes_expanded_forward = 0
+        self.nodes_expanded_backward = 0
 
     def initialize_start_goal_states(self):
         """
@@ -24,98 +85,538 @@ class PathFinding:
                 elif self.is_goal(state):
                     self.goal_state = state
 
-    def greedy_search_up_down(self):
+    def get_flat_grid(self):
+        """
+        Builds the FlatGrid of the maze the first time it is needed.
+        :return: the FlatGrid of the maze
+        """
+        if self.flat_grid is None:
+            self.flat_grid = FlatGrid(self.maze, self.start_state, self.goal_state)
+        return self.flat_grid
+
+    def label_components(self, diagonal=False):
+        """
+        Labels the connected components of the maze once per movement model and caches the labels, in this
+        PathFinding and in the component_label_arrays cache. The first search for a movement model calls this, so
+        the searches return at once, without searching, when the start and goal states are in different components.
+        :param diagonal: True to label with diagonal moves, False to only use moves up, down, left, and right
+        :return: an array with the component label of every index of the flat grid, 0 for blocked cells
+        """
+        if diagonal not in self.component_labels:
+            grid = self.get_flat_grid()
+            key = (grid.content_hash(), diagonal)
+            labels = component_label_arrays.get(key)
+            if labels is None:
+                offsets = grid.diagonal_offsets if diagonal else grid.up_down_offsets
+                labels = grid.label_components(offsets)
+                component_label_arrays.put(key, labels)
+            self.component_labels[diagonal] = labels
+        return self.component_labels[diagonal]
+
+    def in_same_component(self, state_1, state_2, diagonal=False):
+        """
+        Determines whether one state can be reached from the other using the component labels.
+        :param state_1: first ordered pair in the form (x1, y1)
+        :param state_2: second ordered pair in the form (x2, y2)
+        :param diagonal: True for the maze where you can also move diagonally
+        :return: True if both states are open and in the same component, False otherwise.
+        """
+        labels = self.label_components(diagonal)
+        grid = self.get_flat_grid()
+        label = labels[grid.index(state_1)]
+        return label != 0 and label == labels[grid.index(state_2)]
+
+    def is_known_unreachable(self, diagonal):
+        """
+        Determines whether the goal state is unreachable from the start state, labelling the components of the maze
+        for the movement model the first time. The labelling is one pass over the grid, which costs about as much as
+        a search that floods the maze, so a maze without a solution costs one pass instead of one flood per search,
+        and every later search of the maze is answered in constant time.
+        :param diagonal: True for the maze where you can also move diagonally
+        :return: True if the goal state is not in the component of the start state
+        """
+        if self.start_state is None or self.goal_state is None:
+            return False
+        return not self.in_same_component(self.start_state, self.goal_state, diagonal)
+
+    def get_distance_field(self, diagonal=False):
+        """
+        Finds the distance from every cell of the maze to the goal state.
+        The field is built once per maze, goal and movement model and kept in the distance_fields cache.
+        :param diagonal: True for the maze where you can also move diagonally
+        :return: a pair of arrays (distances, next_steps) indexed by the flat grid, see FlatGrid.distance_field
+        """
+        grid = self.get_flat_grid()
+        key = (grid.content_hash(), grid.goal_index, diagonal)
+        field = distance_fields.get(key)
+        if field is None:
+            offsets = grid.diagonal_offsets if diagonal else grid.up_down_offsets
+            field = grid.distance_field(grid.goal_index, offsets)
+            distance_fields.put(key, field)
+        return field
+
+    def shortest_path_from(self, state, diagonal=False):
+        """
+        Find a shortest path from any state to the goal state by following the distance field of the goal.
+        Once the field is built this takes time proportional to the length of the path.
+        :param state: an ordered pair as a tuple (x, y) to start from
+        :param diagonal: True for the maze where you can also move diagonally
+        :return: a list of states from state to the goal state, or None if the goal cannot be reached from state
+        """
+        distances, next_steps = self.get_distance_field(diagonal)
+        grid = self.get_flat_grid()
+        index = grid.index(state)
+        if distances[index] < 0:
+            return None
+        path = [state]
+        while index != grid.goal_index:
+            index = next_steps[index]
+            path.append(grid.state(index))
+        return path
+
+    def greedy_search_up_down(self, stats=None):
         """
         Find the path from start to goal using greedy search in a maze where you can only move up, down, left, or right.
         The path is represented by a map from states to its previous state.
         Example: if came_from[(x_1, y_1)] = (x_2, y_2) and came_from[(x_2, y_2)] = (x_3, y_3),
                  then the path should be [(x_3, y_3), (x_2, y_2), x_1, y_1)]
+        :param stats: a SearchStats to collect the counters and timings of the search, or None
         :return: a map from state to which state it came from.
         """
-        frontier = []
-        heapq.heappush(frontier, (0, self.start_state))
+        if self.is_known_unreachable(False):
+            return {self.start_state: None}
+        if self.use_flat_grid:
+            grid = self.get_flat_grid()
+            return grid.to_state_map(
+                grid.greedy_search(grid.up_down_offsets, grid.manhattan_heuristic, self.new_open_list(True), stats))
+
+        return self.greedy_search(self.get_open_neighbours_up_down, self.manhattan_heuristic, stats)
+
+    def a_star_search_up_down(self, stats=None):
+        """
+        Find the path from start to goal using A* search in a maze where you can only move up, down, left, or right.
+        The path is represented by a map from states to its previous state.
+        Example: if came_from[(x_1, y_1)] = (x_2, y_2) and came_from[(x_2, y_2)] = (x_3, y_3),
+                 then the path should be [(x_3, y_3), (x_2, y_2), x_1, y_1)]
+        :param stats: a SearchStats to collect the counters and timings of the search, or None
+        :return: a map from state to which state it came from.
+        """
+        if self.is_known_unreachable(False):
+            return {self.start_state: None}
+        if self.use_flat_grid:
+            grid = self.get_flat_grid()
+            return grid.to_state_map(
+                grid.a_star_search(grid.up_down_offsets, grid.manhattan_heuristic, self.new_open_list(), stats))
+
+        return self.a_star_search(self.get_open_neighbours_up_down, self.manhattan_heuristic, stats)
+
+    def greedy_search_diagonal(self, stats=None):
+        """
+        Find the path from start to goal using greedy search in a maze where you can also move diagonally.
+        The path is represented by a map from states to its previous state.
+        Example: if came_from[(x_1, y_1)] = (x_2, y_2) and came_from[(x_2, y_2)] = (x_3, y_3),
+                 then the path should be [(x_3, y_3), (x_2, y_2), x_1, y_1)]
+        :param stats: a SearchStats to collect the counters and timings of the search, or None
+        :return: a map from state to which state it came from.
+        """
+        if self.is_known_unreachable(True):
+            return {self.start_state: None}
+        if self.use_flat_grid:
+            grid = self.get_flat_grid()
+            return grid.to_state_map(
+                grid.greedy_search(grid.diagonal_offsets, grid.chebyshev_heuristic, self.new_open_list(True), stats))
+
+        return self.greedy_search(self.get_open_neighbours_diagonal, self.chebyshev_heuristic, stats)
+
+    def a_star_search_diagonal(self, stats=None):
+        """
+        Find the path from start to goal using A* search in a maze where you can also move diagonally.
+        The path is represented by a map from states to their previous state.
+        Example: if came_from[(x_1, y_1)] = (x_2, y_2) and came_from[(x_2, y_2)] = (x_3, y_3),
+                 then the path should be [(x_3, y_3), (x_2, y_2), x_1, y_1)]
+        :param stats: a SearchStats to collect the counters and timings of the search, or None
+        :return: a map from states to their previous state
+        """
+        if self.is_known_unreachable(True):
+            return {self.start_state: None}
+        if self.use_flat_grid:
+            grid = self.get_flat_grid()
+            return grid.to_state_map(
+                grid.a_star_search(grid.diagonal_offsets, grid.chebyshev_heuristic, self.new_open_list(), stats))
+
+        return self.a_star_search(self.get_open_neighbours_diagonal, self.chebyshev_heuristic, stats)
+
+    def new_open_list(self, greedy=False):
+        """
+        Creates the open list for a search from the open list class given to the constructor.
+        The open list is kept in self.open_list so that its push and pop counts can be read after the search.
+        :param greedy: True for a greedy search, whose priorities drop below the last popped one when the search moves
+                       closer to the goal. An open list class that cannot take that, such as RadixHeapOpenList, is
+                       replaced by a BucketOpenList for it, so the search does not fail halfway.
+        :return: an empty open list
+        """
+        if greedy and getattr(self.open_list_class, 'monotone', False):
+            self.open_list = BucketOpenList()
+        else:
+            self.open_list = self.open_list_class()
+        return self.open_list
+
+    def greedy_search(self, get_open_neighbours, heuristic, stats=None):
+        """
+        Greedy search from start to goal, ordering the open list by the heuristic only.
+        :param get_open_neighbours: a function from a state to its open neighbours
+        :param heuristic: a function from a state to its heuristic value
+        :param stats: a SearchStats to collect the counters and timings of the search, or None
+        :return: a map from states to their previous state
+        """
+        if stats is not None:
+            get_open_neighbours = stats.timed_neighbours(get_open_neighbours)
+            heuristic = stats.timed_heuristic(heuristic)
+            stats.start()
+        frontier = self.new_open_list(greedy=True)
+        frontier.push(0, 0, self.start_state)
+        if stats is not None:
+            stats.push(self.start_state, 0, len(frontier))
         came_from = dict()
         came_from[self.start_state] = None
 
         while len(frontier) > 0:
-            current = heapq.heappop(frontier)
-            current_state = current[1]
+            current_state = frontier.pop()[2]
+            if stats is not None:
+                stats.expand(current_state)
             if self.is_goal(current_state):
                 break
-            open_neighbours = self.get_open_neighbours_up_down(current_state)
-            for next_state in open_neighbours:
+            for next_state in get_open_neighbours(current_state):
                 if next_state not in came_from:
-                    priority = self.manhattan_heuristic(next_state)
-                    heapq.heappush(frontier, (priority, next_state))
+                    priority = heuristic(next_state)
+                    frontier.push(priority, 0, next_state)
                     came_from[next_state] = current_state
+                    if stats is not None:
+                        stats.push(next_state, priority, len(frontier))
+        if stats is not None:
+            stats.stop()
         return came_from
 
-    def a_star_search_up_down(self):
+    def a_star_search(self, get_open_neighbours, heuristic, stats=None):
         """
-        Find the path from start to goal using A* search in a maze where you can only move up, down, left, or right.
-        The path is represented by a map from states to its previous state.
-        Example: if came_from[(x_1, y_1)] = (x_2, y_2) and came_from[(x_2, y_2)] = (x_3, y_3),
-                 then the path should be [(x_3, y_3), (x_2, y_2), x_1, y_1)]
-        :return: a map from state to which state it came from.
+        A* search from start to goal where every move costs 1.
+        An entry whose cost is larger than the best known cost of its state is stale: a cheaper path to the state was
+        found after it was pushed, so it is skipped instead of being expanded again.
+        :param get_open_neighbours: a function from a state to its open neighbours
+        :param heuristic: a function from a state to its heuristic value
+        :param stats: a SearchStats to collect the counters and timings of the search, or None
+        :return: a map from states to their previous state
         """
-        frontier = []
-        heapq.heappush(frontier, (0, self.start_state))
+        if stats is not None:
+            get_open_neighbours = stats.timed_neighbours(get_open_neighbours)
+            heuristic = stats.timed_heuristic(heuristic)
+            stats.start()
+        frontier = self.new_open_list()
+        frontier.push(0, 0, self.start_state)
+        if stats is not None:
+            stats.push(self.start_state, 0, len(frontier))
         came_from = dict()
         cost_so_far = dict()
         came_from[self.start_state] = None
         cost_so_far[self.start_state] = 0
 
         while len(frontier) > 0:
-            current = heapq.heappop(frontier)
-            current_state = current[1]
+            priority, cost, current_state = frontier.pop()
+            if cost > cost_so_far[current_state]:
+                if stats is not None:
+                    stats.stale_pop()
+                continue
+            if stats is not None:
+                stats.expand(current_state)
             if self.is_goal(current_state):
                 break
-            open_neighbours = self.get_open_neighbours_up_down(current_state)
-            for next_state in open_neighbours:
-                new_cost = cost_so_far[current_state] + 1
+            new_cost = cost + 1
+            for next_state in get_open_neighbours(current_state):
                 if next_state not in cost_so_far or new_cost < cost_so_far[next_state]:
                     cost_so_far[next_state] = new_cost
-                    priority = new_cost + self.manhattan_heuristic(next_state)
-                    heapq.heappush(frontier, (priority, next_state))
+                    priority = new_cost + heuristic(next_state)
+                    frontier.push(priority, new_cost, next_state)
                     came_from[next_state] = current_state
+                    if stats is not None:
+                        stats.push(next_state, priority, len(frontier))
+        if stats is not None:
+            stats.stop()
         return came_from
 
-    def greedy_search_diagonal(self):
+    def anytime_a_star_search_up_down(self, time_budget=None, expansion_budget=None, initial_weight=3.0,
+                                      weight_step=0.5, stats=None):
         """
-        Find the path from start to goal using greedy search in a maze where you can also move diagonally.
-        The path is represented by a map from states to its previous state.
-        Example: if came_from[(x_1, y_1)] = (x_2, y_2) and came_from[(x_2, y_2)] = (x_3, y_3),
-                 then the path should be [(x_3, y_3), (x_2, y_2), x_1, y_1)]
-        :return: a map from state to which state it came from.
+        Find paths from start to goal using anytime repairing A* (ARA*) in a maze where you can only move up, down,
+        left, or right. See anytime_a_star_search.
+        :return: a generator of pairs (path_map, bound)
         """
-        frontier = []
-        heapq.heappush(frontier, (0, self.start_state))
-        came_from = dict()
-        came_from[self.start_state] = None
+        return self.anytime_a_star_search(self.get_open_neighbours_up_down, self.manhattan_heuristic, False,
+                                          time_budget, expansion_budget, initial_weight, weight_step, stats)
 
-        while len(frontier) > 0:
-            current = heapq.heappop(frontier)
-            current_state = current[1]
-            if self.is_goal(current_state):
+    def anytime_a_star_search_diagonal(self, time_budget=None, expansion_budget=None, initial_weight=3.0,
+                                       weight_step=0.5, stats=None):
+        """
+        Find paths from start to goal using anytime repairing A* (ARA*) in a maze where you can also move diagonally.
+        See anytime_a_star_search.
+        :return: a generator of pairs (path_map, bound)
+        """
+        return self.anytime_a_star_search(self.get_open_neighbours_diagonal, self.chebyshev_heuristic, True,
+                                          time_budget, expansion_budget, initial_weight, weight_step, stats)
+
+    def anytime_a_star_search(self, get_open_neighbours, heuristic, diagonal, time_budget=None,
+                              expansion_budget=None, initial_weight=3.0, weight_step=0.5, stats=None):
+        """
+        Anytime repairing A* (ARA*) where every move costs 1.
+        The first search orders the open list by cost + weight * heuristic with a large weight, which finds a path
+        quickly whose cost is at most weight times the shortest. Each following search lowers the weight and goes
+        on from the costs found so far: only the states whose cost improved since they were last expanded are put
+        back on the open list, so no state is expanded twice in one search. This goes on until the path is proven
+        to be the shortest or the budget runs out.
+        The first path is always found whatever the budget, so there is always a path to use. The budget then only
+        stops the following searches, and a search that is stopped by it yields nothing.
+        :param get_open_neighbours: a function from a state to its open neighbours
+        :param heuristic: a function from a state to its heuristic value
+        :param diagonal: True for the maze where you can also move diagonally
+        :param time_budget: the number of seconds the searches may take in total, or None for no limit
+        :param expansion_budget: the number of expansions the searches may make in total, or None for no limit
+        :param initial_weight: the weight of the heuristic in the first search, at least 1
+        :param weight_step: how much the weight is lowered after each search
+        :param stats: a SearchStats to collect the counters and timings of the searches, or None
+        :return: a generator of pairs (path_map, bound), one per search, where path_map maps the states on the path
+                 to their previous state and the cost of the path is at most bound times the cost of the shortest
+                 path. The last bound is 1 when the path is the shortest. When there is no path, path_map only
+                 contains the start state and the bound is 1.
+        """
+        if weight_step <= 0:
+            raise ValueError('the weight step must be positive, got {}'.format(weight_step))
+        if self.is_known_unreachable(diagonal):
+            yield {self.start_state: None}, 1.0
+            return
+        if stats is not None:
+            get_open_neighbours = stats.timed_neighbours(get_open_neighbours)
+            heuristic = stats.timed_heuristic(heuristic)
+        deadline = time.perf_counter() + time_budget if time_budget is not None else None
+        goal_state = self.goal_state
+        weight = max(1.0, initial_weight)
+        came_from = {self.start_state: None}
+        cost_so_far = {self.start_state: 0}
+        # the open list holds (priority, state, cost) entries; an entry is stale when its state has been expanded
+        # or reached more cheaply since it was pushed
+        frontier = [(weight * heuristic(self.start_state), self.start_state, 0)]
+        open_states = {self.start_state}
+        inconsistent = set()  # states whose cost improved after they were expanded in the current search
+        expansions = 0
+        is_first_search = True
+
+        while True:
+            if stats is not None:
+                stats.start()
+            closed = set()
+            is_stopped = False
+            goal_cost = cost_so_far.get(goal_state, float('inf'))
+            while frontier and frontier[0][0] < goal_cost:
+                if not is_first_search and ((expansion_budget is not None and expansions >= expansion_budget) or
+                                            (deadline is not None and time.perf_counter() >= deadline)):
+                    is_stopped = True
+                    break
+                priority, current_state, cost = heapq.heappop(frontier)
+                if current_state in closed or cost > cost_so_far[current_state]:
+                    if stats is not None:
+                        stats.stale_pop()
+                    continue
+                open_states.discard(current_state)
+                closed.add(current_state)
+                expansions += 1
+                if stats is not None:
+                    stats.expand(current_state)
+                new_cost = cost + 1
+                for next_state in get_open_neighbours(current_state):
+                    if next_state not in cost_so_far or new_cost < cost_so_far[next_state]:
+                        cost_so_far[next_state] = new_cost
+                        came_from[next_state] = current_state
+                        if next_state in closed:
+                            inconsistent.add(next_state)
+                            continue
+                        priority = new_cost + weight * heuristic(next_state)
+                        heapq.heappush(frontier, (priority, next_state, new_cost))
+                        open_states.add(next_state)
+                        if stats is not None:
+                            stats.push(next_state, priority, len(frontier))
+                goal_cost = cost_so_far.get(goal_state, float('inf'))
+            if stats is not None:
+                stats.stop()
+            if is_stopped:
+                return
+            is_first_search = False
+
+            if goal_cost == float('inf'):
+                # every reachable state has been expanded, so there is no path at any weight
+                yield {self.start_state: None}, 1.0
+                return
+            # no path can be cheaper than the smallest cost + heuristic of the states still to be expanded
+            remaining = open_states | inconsistent
+            lower_bound = min((cost_so_far[state] + heuristic(state) for state in remaining), default=goal_cost)
+            bound = min(weight, goal_cost / lower_bound) if lower_bound > 0 else 1.0
+            path_map = {goal_state: came_from[goal_state]}
+            state = came_from[goal_state]
+            while state is not None:
+                path_map[state] = came_from[state]
+                state = came_from[state]
+            yield path_map, max(1.0, bound)
+            if bound <= 1:
+                return
+
+            weight = max(1.0, min(weight - weight_step, bound))
+            open_states = remaining
+            inconsistent = set()
+            frontier = [(cost_so_far[state] + weight * heuristic(state), state, cost_so_far[state])
+                        for state in open_states]
+            heapq.heapify(frontier)
+
+    def bidirectional_a_star_search_up_down(self, stats=None):
+        """
+        Find the path from start to goal using bidirectional A* search in a maze where you can only move up, down,
+        left, or right. One search runs from the start state and one from the goal state.
+        The number of nodes expanded by each search is stored in self.nodes_expanded_forward and
+        self.nodes_expanded_backward.
+        :param stats: a SearchStats to collect the counters and timings of the search, or None
+        :return: a map from states to their previous state
+        """
+        if self.is_known_unreachable(False):
+            return {self.start_state: None}
+        return self.bidirectional_a_star_search(self.get_open_neighbours_up_down, self.manhattan_distance, stats)
+
+    def bidirectional_a_star_search_diagonal(self, stats=None):
+        """
+        Find the path from start to goal using bidirectional A* search in a maze where you can also move diagonally.
+        The number of nodes expanded by each search is stored in self.nodes_expanded_forward and
+        self.nodes_expanded_backward.
+        :param stats: a SearchStats to collect the counters and timings of the search, or None
+        :return: a map from states to their previous state
+        """
+        if self.is_known_unreachable(True):
+            return {self.start_state: None}
+        return self.bidirectional_a_star_search(self.get_open_neighbours_diagonal, self.chebyshev_distance, stats)
+
+    def bidirectional_a_star_search(self, get_open_neighbours, distance, stats=None):
+        """
+        Bidirectional A* search where every move costs 1.
+        The forward search is guided by the distance to the goal state and the backward search by the distance to
+        the start state. Whenever a state is reached by both searches the path through it is a candidate, and the
+        search stops once the smallest priority on either frontier is no smaller than the best candidate, since
+        no path through the unexpanded states of that frontier can be shorter.
+        :param get_open_neighbours: a function from a state to its open neighbours
+        :param distance: the distance used as heuristic, Manhattan or Chebyshev
+        :param stats: a SearchStats to collect the counters and timings of the search, or None
+        :return: a map from states to their previous state
+        """
+        if stats is not None:
+            get_open_neighbours = stats.timed_neighbours(get_open_neighbours)
+            distance = stats.timed_heuristic(distance)
+            stats.start()
+        targets = [self.goal_state, self.start_state]
+        frontiers = [[(distance(self.start_state, self.goal_state), self.start_state)],
+                     [(distance(self.goal_state, self.start_state), self.goal_state)]]
+        came_from = [{self.start_state: None}, {self.goal_state: None}]
+        cost_so_far = [{self.start_state: 0}, {self.goal_state: 0}]
+        expanded = [set(), set()]
+        best_cost = float('inf')
+        meeting_state = self.start_state if self.start_state == self.goal_state else None
+        if stats is not None:
+            stats.push(self.start_state, frontiers[0][0][0], 1)
+            stats.push(self.goal_state, frontiers[1][0][0], 2)
+
+        while len(frontiers[0]) > 0 and len(frontiers[1]) > 0:
+            if frontiers[0][0][0] >= best_cost or frontiers[1][0][0] >= best_cost:
                 break
-            open_neighbours = self.get_open_neighbours_diagonal(current_state)
-            for next_state in open_neighbours:
-                if next_state not in came_from:
-                    priority = self.chebyshev_heuristic(next_state)
-                    heapq.heappush(frontier, (priority, next_state))
-                    came_from[next_state] = current_state
-        return came_from
+            # expand the smaller frontier, or the side that expanded fewer states on a tie;
+            # 0 is forward and 1 is backward
+            side = 0 if (len(frontiers[0]), len(expanded[0])) <= (len(frontiers[1]), len(expanded[1])) else 1
+            current_state = heapq.heappop(frontiers[side])[1]
+            if current_state in expanded[side]:
+                if stats is not None:
+                    stats.stale_pop()
+                continue
+            expanded[side].add(current_state)
+            if stats is not None:
+                stats.expand(current_state)
+            other_cost_so_far = cost_so_far[1 - side]
+            for next_state in get_open_neighbours(current_state):
+                new_cost = cost_so_far[side][current_state] + 1
+                if next_state not in cost_so_far[side] or new_cost < cost_so_far[side][next_state]:
+                    cost_so_far[side][next_state] = new_cost
+                    priority = new_cost + distance(next_state, targets[side])
+                    heapq.heappush(frontiers[side], (priority, next_state))
+                    came_from[side][next_state] = current_state
+                    if stats is not None:
+                        stats.push(next_state, priority, len(frontiers[0]) + len(frontiers[1]))
+                    if next_state in other_cost_so_far and new_cost + other_cost_so_far[next_state] < best_cost:
+                        best_cost = new_cost + other_cost_so_far[next_state]
+                        meeting_state = next_state
+
+        if stats is not None:
+            stats.stop()
+        self.nodes_expanded_forward = len(expanded[0])
+        self.nodes_expanded_backward = len(expanded[1])
+        path_map = came_from[0]
+        if meeting_state is not None:
+            # reverse the backward part of the path so that it leads from the meeting state to the goal
+            current_state = meeting_state
+            while came_from[1][current_state] is not None:
+                next_state = came_from[1][current_state]
+                path_map[next_state] = current_state
+                current_state = next_state
+        return path_map
 
-    def a_star_search_diagonal(self):
+    def jump_point_search_up_down(self, stats=None):
         """
-        Find the path from start to goal using A* search in a maze where you can also move diagonally.
-        The path is represented by a map from states to their previous state.
-        Example: if came_from[(x_1, y_1)] = (x_2, y_2) and came_from[(x_2, y_2)] = (x_3, y_3),
-                 then the path should be [(x_3, y_3), (x_2, y_2), x_1, y_1)]
+        Find the path from start to goal using Jump Point Search in a maze where you can only move up, down, left,
+        or right. Instead of pushing every open neighbour, the search jumps along straight lines and only pushes
+        the cells where the path may have to turn.
+        The gaps between the jump points on the final path are filled in, so the returned map can be passed
+        to get_result_maze like the result of a_star_search_up_down.
+        :param stats: a SearchStats to collect the counters and timings of the search, or None
+        :return: a map from states to their previous state
+        """
+        if self.is_known_unreachable(False):
+            return {self.start_state: None}
+        return self.jump_point_search(self.get_jump_directions_up_down, self.jump_up_down,
+                                      self.manhattan_heuristic, self.manhattan_distance, stats)
+
+    def jump_point_search_diagonal(self, stats=None):
+        """
+        Find the path from start to goal using Jump Point Search in a maze where you can also move diagonally.
+        The gaps between the jump points on the final path are filled in, so the returned map can be passed
+        to get_result_maze like the result of a_star_search_diagonal.
+        :param stats: a SearchStats to collect the counters and timings of the search, or None
         :return: a map from states to their previous state
         """
+        if self.is_known_unreachable(True):
+            return {self.start_state: None}
+        return self.jump_point_search(self.get_jump_directions_diagonal, self.jump_diagonal,
+                                      self.chebyshev_heuristic, self.chebyshev_distance, stats)
+
+    def jump_point_search(self, get_directions, jump, heuristic, distance, stats=None):
+        """
+        A* search over jump points.
+        An entry whose cost is larger than the best known cost of its jump point is stale and skipped, since
+        expanding the jump point again with its best cost could not improve any other jump point.
+        :param get_directions: a function from a state and its parent to the directions worth jumping in
+        :param jump: a function from a state and a direction to the next jump point in that direction, or None
+        :param heuristic: a function from a state to its heuristic value
+        :param distance: a function giving the cost of moving in a straight line between two states
+        :param stats: a SearchStats to collect the counters and timings of the search, or None; the time spent
+                      jumping is counted as neighbour generation
+        :return: a map from states to their previous state, with the gaps on the path to the goal filled in
+        """
+        if stats is not None:
+            jump = stats.timed_neighbours(jump)
+            heuristic = stats.timed_heuristic(heuristic)
+            stats.start()
         frontier = []
-        heapq.heappush(frontier, (0, self.start_state))
+        heapq.heappush(frontier, (0, 0, self.start_state))
+        if stats is not None:
+            stats.push(self.start_state, 0, len(frontier))
         came_from = dict()
         cost_so_far = dict()
         came_from[self.start_state] = None
@@ -123,19 +624,229 @@ class PathFinding:
 
         while len(frontier) > 0:
             current = heapq.heappop(frontier)
-            current_state = current[1]
+            current_state = current[2]
+            if -current[1] > cost_so_far[current_state]:
+                if stats is not None:
+                    stats.stale_pop()
+                continue
+            if stats is not None:
+                stats.expand(current_state)
             if self.is_goal(current_state):
                 break
-            open_neighbours = self.get_open_neighbours_diagonal(current_state)
-            for next_state in open_neighbours:
-                new_cost = cost_so_far[current_state] + 1
-                if next_state not in cost_so_far or new_cost < cost_so_far[next_state]:
-                    cost_so_far[next_state] = new_cost
-                    priority = new_cost + self.chebyshev_heuristic(next_state)
-                    heapq.heappush(frontier, (priority, next_state))
-                    came_from[next_state] = current_state
+            for direction in get_directions(current_state, came_from[current_state]):
+                jump_point = jump(current_state, direction)
+                if jump_point is None:
+                    continue
+                new_cost = cost_so_far[current_state] + distance(current_state, jump_point)
+                if jump_point not in cost_so_far or new_cost < cost_so_far[jump_point]:
+                    cost_so_far[jump_point] = new_cost
+                    priority = new_cost + heuristic(jump_point)
+                    # ties are broken by the larger cost so the search follows one line of jump points at a time
+                    heapq.heappush(frontier, (priority, -new_cost, jump_point))
+                    came_from[jump_point] = current_state
+                    if stats is not None:
+                        stats.push(jump_point, priority, len(frontier))
+
+        if stats is not None:
+            stats.stop()
+        if self.goal_state in came_from:
+            self.fill_jump_gaps(came_from)
         return came_from
 
+    def fill_jump_gaps(self, came_from):
+        """
+        Adds the states between consecutive jump points on the path to the goal to came_from.
+        :param came_from: a map from jump points to their previous jump point
+        """
+        state = self.goal_state
+        while came_from[state] is not None:
+            parent = came_from[state]
+            step_row = (parent[0] > state[0]) - (parent[0] < state[0])
+            step_col = (parent[1] > state[1]) - (parent[1] < state[1])
+            cell = state
+            while cell != parent:
+                previous = (cell[0] + step_row, cell[1] + step_col)
+                came_from[cell] = previous
+                cell = previous
+            state = parent
+
+    def get_jump_directions_up_down(self, state, parent):
+        """
+        Find the directions worth jumping in from a jump point when you can only move up, down, left, or right.
+        Moving along a row you may need to turn at any cell, so both vertical directions stay open;
+        moving along a column only the forward direction is kept since the row jumps are checked while jumping.
+        :param state: an ordered pair as a tuple (x, y)
+        :param parent: the jump point state was reached from, or None for the start state
+        :return: a list of directions (d_x, d_y)
+        """
+        if parent is None:
+            return [(-1, 0), (1, 0), (0, -1), (0, 1)]
+        d_row = (state[0] > parent[0]) - (state[0] < parent[0])
+        d_col = (state[1] > parent[1]) - (state[1] < parent[1])
+        if d_col != 0:
+            return [(0, d_col), (-1, 0), (1, 0)]
+        return [(d_row, 0), (0, -1), (0, 1)]
+
+    def jump_up_down(self, state, direction):
+        """
+        Moves from state in the given direction until a jump point is found when you can only move up, down,
+        left, or right. A jump point is the goal, a cell with a forced neighbour, or, when moving along a column,
+        a cell from which a jump along its row finds a jump point.
+        :param state: an ordered pair as a tuple (x, y)
+        :param direction: the direction (d_x, d_y) to move in
+        :return: the next jump point, or None if a blocked cell is reached first
+        """
+        d_row, d_col = direction
+        row, col = state
+        while True:
+            row += d_row
+            col += d_col
+            if not self.is_open((row, col)):
+                return None
+            if self.is_goal((row, col)):
+                return row, col
+            if d_col != 0:
+                if (self.is_open((row - 1, col)) and not self.is_open((row - 1, col - d_col))) or \
+                        (self.is_open((row + 1, col)) and not self.is_open((row + 1, col - d_col))):
+                    return row, col
+            else:
+                if (self.is_open((row, col - 1)) and not self.is_open((row - d_row, col - 1))) or \
+                        (self.is_open((row, col + 1)) and not self.is_open((row - d_row, col + 1))):
+                    return row, col
+                if self.jump_up_down((row, col), (0, 1)) is not None or \
+                        self.jump_up_down((row, col), (0, -1)) is not None:
+                    return row, col
+
+    def get_jump_directions_diagonal(self, state, parent):
+        """
+        Find the directions worth jumping in from a jump point when you can also move diagonally.
+        These are the natural directions of the move from parent plus the directions of any forced neighbours.
+        :param state: an ordered pair as a tuple (x, y)
+        :param parent: the jump point state was reached from, or None for the start state
+        :return: a list of directions (d_x, d_y)
+        """
+        if parent is None:
+            return [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
+        row, col = state
+        d_row = (row > parent[0]) - (row < parent[0])
+        d_col = (col > parent[1]) - (col < parent[1])
+        if d_row != 0 and d_col != 0:
+            directions = [(d_row, 0), (0, d_col), (d_row, d_col)]
+            if not self.is_open((row - d_row, col)):
+                directions.append((-d_row, d_col))
+            if not self.is_open((row, col - d_col)):
+                directions.append((d_row, -d_col))
+        elif d_row != 0:
+            directions = [(d_row, 0)]
+            if not self.is_open((row, col + 1)):
+                directions.append((d_row, 1))
+            if not self.is_open((row, col - 1)):
+                directions.append((d_row, -1))
+        else:
+            directions = [(0, d_col)]
+            if not self.is_open((row + 1, col)):
+                directions.append((1, d_col))
+            if not self.is_open((row - 1, col)):
+                directions.append((-1, d_col))
+        return directions
+
+    def jump_diagonal(self, state, direction):
+        """
+        Moves from state in the given direction until a jump point is found when you can also move diagonally.
+        A jump point is the goal, a cell with a forced neighbour, or, when moving diagonally, a cell from which
+        a straight jump finds a jump point.
+        :param state: an ordered pair as a tuple (x, y)
+        :param direction: the direction (d_x, d_y) to move in
+        :return: the next jump point, or None if a blocked cell is reached first
+        """
+        d_row, d_col = direction
+        row, col = state
+        while True:
+            row += d_row
+            col += d_col
+            if not self.is_open((row, col)):
+                return None
+            if self.is_goal((row, col)):
+                return row, col
+            if d_row != 0 and d_col != 0:
+                if (self.is_open((row - d_row, col + d_col)) and not self.is_open((row - d_row, col))) or \
+                        (self.is_open((row + d_row, col - d_col)) and not self.is_open((row, col - d_col))):
+                    return row, col
+                if self.jump_diagonal((row, col), (d_row, 0)) is not None or \
+                        self.jump_diagonal((row, col), (0, d_col)) is not None:
+                    return row, col
+            elif d_row != 0:
+                if (self.is_open((row + d_row, col + 1)) and not self.is_open((row, col + 1))) or \
+                        (self.is_open((row + d_row, col - 1)) and not self.is_open((row, col - 1))):
+                    return row, col
+            else:
+                if (self.is_open((row + 1, col + d_col)) and not self.is_open((row + 1, col))) or \
+                        (self.is_open((row - 1, col + d_col)) and not self.is_open((row - 1, col))):
+                    return row, col
+
+    def hierarchical_search_up_down(self, cluster_size=10, stats=None):
+        """
+        Find a path from start to goal using hierarchical pathfinding (HPA*) in a maze where you can only move up,
+        down, left, or right. The search runs on an abstract graph of clusters of the maze, which is built once per
+        maze and cached, and only the clusters on the abstract path are searched cell by cell.
+        The path is close to, but not always, the shortest path.
+        :param cluster_size: the number of rows and columns of a cluster
+        :param stats: a SearchStats to collect the counters and timings of the search of the abstract graph, or None
+        :return: a map from states on the path to their previous state
+        """
+        if self.is_known_unreachable(False):
+            return {self.start_state: None}
+        grid = self.get_flat_grid()
+        graph = get_abstract_graph(grid, cluster_size, False)
+        return grid.to_state_map(graph.search(grid.start_index, grid.goal_index, grid.manhattan_heuristic, stats))
+
+    def hierarchical_search_diagonal(self, cluster_size=10, stats=None):
+        """
+        Find a path from start to goal using hierarchical pathfinding (HPA*) in a maze where you can also move
+        diagonally. See hierarchical_search_up_down.
+        :param cluster_size: the number of rows and columns of a cluster
+        :param stats: a SearchStats to collect the counters and timings of the search of the abstract graph, or None
+        :return: a map from states on the path to their previous state
+        """
+        if self.is_known_unreachable(True):
+            return {self.start_state: None}
+        grid = self.get_flat_grid()
+        graph = get_abstract_graph(grid, cluster_size, True)
+        return grid.to_state_map(graph.search(grid.start_index, grid.goal_index, grid.chebyshev_heuristic, stats))
+
+    def landmark_a_star_search_up_down(self, num_landmarks=8, strategy='corners', stats=None):
+        """
+        Find the path from start to goal using A* search with the landmark (ALT) heuristic in a maze where you can
+        only move up, down, left, or right. The distances from the landmarks are computed once per maze and cached,
+        see landmarks.py. The path is a shortest path.
+        :param num_landmarks: the largest number of landmarks to place
+        :param strategy: how to place the landmarks, 'corners', 'farthest' or 'random'
+        :param stats: a SearchStats to collect the counters and timings of the search, or None
+        :return: a map from states to their previous state
+        """
+        if self.is_known_unreachable(False):
+            return {self.start_state: None}
+        grid = self.get_flat_grid()
+        tables = get_landmark_tables(grid, False, num_landmarks, strategy)
+        heuristic = tables.make_heuristic(grid.goal_index, grid.manhattan_heuristic)
+        return grid.to_state_map(grid.a_star_search(grid.up_down_offsets, heuristic, self.new_open_list(), stats))
+
+    def landmark_a_star_search_diagonal(self, num_landmarks=8, strategy='corners', stats=None):
+        """
+        Find the path from start to goal using A* search with the landmark (ALT) heuristic in a maze where you can
+        also move diagonally. See landmark_a_star_search_up_down.
+        :param num_landmarks: the largest number of landmarks to place
+        :param strategy: how to place the landmarks, 'corners', 'farthest' or 'random'
+        :param stats: a SearchStats to collect the counters and timings of the search, or None
+        :return: a map from states to their previous state
+        """
+        if self.is_known_unreachable(True):
+            return {self.start_state: None}
+        grid = self.get_flat_grid()
+        tables = get_landmark_tables(grid, True, num_landmarks, strategy)
+        heuristic = tables.make_heuristic(grid.goal_index, grid.chebyshev_heuristic)
+        return grid.to_state_map(grid.a_star_search(grid.diagonal_offsets, heuristic, self.new_open_list(), stats))
+
     def manhattan_heuristic(self, state):
         """
         Calculates the Manhattan heuristic at the state (x, y).
@@ -257,12 +968,53 @@ class PathFinding:
         """
         return self.maze[state[0]][state[1]] == 'X'
 
+    def get_path(self, path_map):
+        """
+        Extracts the path from start to goal from a map from states to their previous state, without changing
+        the maze.
+        :param path_map: a map from states to their previous state
+        :return: the SearchPath from the start state to the goal state, or None if the goal state is not in path_map
+        """
+        if self.goal_state not in path_map:
+            return None
+        coordinates = array('i')
+        current_state = self.goal_state
+        while current_state is not None:
+            coordinates.extend(current_state[::-1])
+            current_state = path_map[current_state]
+        coordinates.reverse()
+        return SearchPath(coordinates)
+
+    def iter_result_rows(self, path):
+        """
+        Draws the path on the maze one row at a time, marking the states between start and goal by 'P',
+        without changing the maze. The rows are the same as the rows of get_result_maze.
+        :param path: a SearchPath, or None to draw the maze without a path
+        :return: a generator of the rows of the maze as strings
+        """
+        path_columns = dict()  # a map from a row to the columns on the path in that row
+        if path is not None:
+            for state in path.states():
+                if state != self.start_state and state != self.goal_state:
+                    path_columns.setdefault(state[0], []).append(state[1])
+        for i in range(len(self.maze)):
+            if i not in path_columns:
+                yield ''.join(self.maze[i])
+                continue
+            row = list(self.maze[i])
+            for j in path_columns[i]:
+                row[j] = 'P'
+            yield ''.join(row)
+
     def get_result_maze(self, path_map):
         """
         Modify the maze such that the path taken between start and goal state is marked by 'P'.
         :param path_map: a map from states to their previous state
         :return: The maze with the path taken marked by 'P'
         """
+        if isinstance(self.maze, MazeView):
+            # a maze loaded from a binary file is read-only, so the result is drawn on a copy
+            self.maze = [list(row) for row in self.maze]
         current_state = self.goal_state
         while current_state != self.start_state:
             if current_state in path_map:
@@ -277,22 +1029,29 @@ class PathFinding:
         return self.maze
 
 
+def iter_mazes(file_name):
+    """
+    Reads the mazes of a file one at a time, so that only the maze being read is held in memory.
+    Mazes are separated by empty lines.
+    :param file_name: input file name
+    :return: a generator of mazes as 2D lists
+    """
+    with open(file_name, 'r') as file:
+        maze = []
+        for line in file:
+            row = list(line.rstrip('\n'))
+            if not row:
+                if len(maze) > 0:
+                    yield maze
+                maze = []
+            else:
+                maze.append(row)
+        if len(maze) > 0:
+            yield maze
+
+
 def read_file(file_name):
-    file = open(file_name, 'r')
-    input_lines = [list(line.rstrip('\n')) for line in file]
-    mazes = []
-    maze = []
-    for line in input_lines:
-        if not line:
-            if len(maze) > 0:
-                mazes.append(maze)
-            maze = []
-        else:
-            maze.append(line)
-    if len(maze) > 0:
-        mazes.append(maze)
-    file.close()
-    return mazes
+    return list(iter_mazes(file_name))
 
 
 def write_to_file(lis_2d, file_name):
@@ -308,6 +1067,25 @@ def write_to_file(lis_2d, file_name):
     file.close()
 
 
+def write_maze(lis_2d, file):
+    """
+    Write a maze to a file that is already open, so that one buffered file can be kept open for a whole run.
+    :param lis_2d: a 2D list
+    :param file: an open output file
+    """
+    file.write(''.join(''.join(row) + '\n' for row in lis_2d))
+
+
+def write_rows(rows, file):
+    """
+    Write rows of text, such as the rows of PathFinding.iter_result_rows, to a file that is already open.
+    :param rows: an iterable of strings
+    :param file: an open output file
+    """
+    for row in rows:
+        file.write(row + '\n')
+
+
 def append_line_to_file(line, file_name):
     file = open(file_name, 'a+')
     file.write(line + '\n')
@@ -348,84 +1126,80 @@ def main():
     output_file_name_up_down = 'pathfinding_a_out.txt'
     output_file_name_diagonal = 'pathfinding_b_out.txt'
 
-    # open and then close the output file with w+ so that the file starts empty
-    file = open(output_file_name_up_down, 'w+')
-    file.close()
-    file = open(output_file_name_diagonal, 'w+')
-    file.close()
-
-    input_mazes_up_down = read_file(input_file_name_up_down)
-    num_input_mazes_up_down = len(input_mazes_up_down)
-    if num_input_mazes_up_down == 0:
-        print("No input mazes for agent to be allowed to only move up, down, left and right.")
-    else:
-        print("Finding solutions to mazes when allowed to move up, down, left and right:")
-        for i in range(num_input_mazes_up_down):
-            maze = input_mazes_up_down[i]
+    # the output files are opened once with w so that they start empty, and stay open until all mazes are written
+    with open(output_file_name_up_down, 'w') as output_file:
+        num_input_mazes_up_down = 0
+        for i, maze in enumerate(iter_mazes(input_file_name_up_down)):
+            if i == 0:
+                print("Finding solutions to mazes when allowed to move up, down, left and right:")
+            num_input_mazes_up_down += 1
             m = len(maze)
             n = len(maze[0])
             print("Finding a solution for maze number", i, "with dimension", m, "by", n)
-            path_finding_up_down_greedy = PathFinding(copy.deepcopy(maze))
+            # the searches do not change the maze, so one PathFinding serves both algorithms
+            path_finding = PathFinding(maze)
             st = time.time()
             # call the algorithm to get path
-            path_up_down_greedy = path_finding_up_down_greedy.greedy_search_up_down()
-            # generate result maze from path
-            result_maze = path_finding_up_down_greedy.get_result_maze(path_up_down_greedy)
+            path = path_finding.get_path(path_finding.greedy_search_up_down())
+            if path is None:
+                print('    There is no solution for this maze.')
             # write algorithm name to file
-            append_line_to_file('Greedy', output_file_name_up_down)
-            # write maze to file
-            write_to_file(result_maze, output_file_name_up_down)
+            output_file.write('Greedy\n')
+            # write maze with the path to file
+            write_rows(path_finding.iter_result_rows(path), output_file)
             print("    the time used for greedy algorithm is", time.time() - st)
 
-            path_finding_up_down_a_star = PathFinding(copy.deepcopy(maze))
             st = time.time()
             # call the algorithm to get path
-            path_up_down_a_star = path_finding_up_down_a_star.a_star_search_up_down()
-            # generate result maze from path
-            result_maze = path_finding_up_down_a_star.get_result_maze(path_up_down_a_star)
+            path = path_finding.get_path(path_finding.a_star_search_up_down())
+            if path is None:
+                print('    There is no solution for this maze.')
             # write algorithm name to file
-            append_line_to_file('A*', output_file_name_up_down)
-            # write maze to file
-            write_to_file(result_maze, output_file_name_up_down)
-            append_line_to_file('', output_file_name_up_down)
+            output_file.write('A*\n')
+            # write maze with the path to file
+            write_rows(path_finding.iter_result_rows(path), output_file)
+            output_file.write('\n')
             print("    the time used for A* algorithm is", time.time() - st)
+        if num_input_mazes_up_down == 0:
+            print("No input mazes for agent to be allowed to only move up, down, left and right.")
     print()
 
-    input_mazes_diagonal = read_file(input_file_name_diagonal)
-    num_input_mazes_diagonal = len(input_mazes_diagonal)
-    if num_input_mazes_diagonal == 0:
-        print("No input maze fow agent to be allowed to also move diagonally.")
-    else:
-        print("Finding solutions to mazes when also allowed to move diagonally:")
-        for i in range(num_input_mazes_diagonal):
-            maze = input_mazes_diagonal[i]
+    with open(output_file_name_diagonal, 'w') as output_file:
+        num_input_mazes_diagonal = 0
+        for i, maze in enumerate(iter_mazes(input_file_name_diagonal)):
+            if i == 0:
+                print("Finding solutions to mazes when also allowed to move diagonally:")
+            num_input_mazes_diagonal += 1
             m = len(maze)
             n = len(maze[0])
             print("Finding a solution for maze number", i, "with dimension", m, "by", n)
-            path_finding_diagonal_greedy = PathFinding(copy.deepcopy(maze))
+            # the searches do not change the maze, so one PathFinding serves both algorithms
+            path_finding = PathFinding(maze)
             st = time.time()
             # call the algorithm to get path
-            path_diagonal_greedy = path_finding_diagonal_greedy.greedy_search_diagonal()
-            # generate result maze from path
-            result_maze = path_finding_diagonal_greedy.get_result_maze(path_diagonal_greedy)
+            path = path_finding.get_path(path_finding.greedy_search_diagonal())
+            if path is None:
+                print('    There is no solution for this maze.')
             # write algorithm name to file
-            append_line_to_file('Greedy', output_file_name_diagonal)
-            # write maze to file
-            write_to_file(result_maze, output_file_name_diagonal)
+            output_file.write('Greedy\n')
+            # write maze with the path to file
+            write_rows(path_finding.iter_result_rows(path), output_file)
             print("    the time used for greedy algorithm is", time.time() - st)
 
-            path_finding_diagonal_a_star = PathFinding(copy.deepcopy(maze))
             st = time.time()
             # call the algorithm to get path
-            path_diagonal_a_star = path_finding_diagonal_a_star.a_star_search_diagonal()
-            # generate result maze from path
-            result_maze = path_finding_diagonal_a_star.get_result_maze(path_diagonal_a_star)
+            path = path_finding.get_path(path_finding.a_star_search_diagonal())
+            if path is None:
+                print('    There is no solution for this maze.')
             # write algorithm name to file
-            append_line_to_file('A*', output_file_name_diagonal)
-            # write maze to file
-            write_to_file(result_maze, output_file_name_diagonal)
-            append_line_to_file('', output_file_name_diagonal)
+            output_file.write('A*\n')
+            # write maze with the path to file
+            write_rows(path_finding.iter_result_rows(path), output_file)
+            output_file.write('\n')
             print("    the time used for A* algorithm is", time.time() - st)
+        if num_input_mazes_diagonal == 0:
+            print("No input maze fow agent to be allowed to also move diagonally.")
 
 
-main()
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,7 @@
 import random
 
+from pathfinding import write_maze
+
 
 def print_maze(maze):
     for m in maze:
@@ -38,35 +40,15 @@ def create_maze(m, n, blocked_probability):
     return maze
 
 
-def append_line_to_file(line, file_name):
-    file = open(file_name, 'a+')
-    file.write(line + '\n')
-    file.close()
-
-
-def write_to_file(lis_2d, file_name):
-    """
-    Write the data to output file.
-    :param lis_2d: a 2D list
-    :param file_name: output file name
-    """
-    file = open(file_name, 'a+')
-    for row in range(0, len(lis_2d)):
-        new_line = ''.join(lis_2d[row])
-        file.write(new_line + '\n')
-    file.close()
-
-
 def write_new_maze_to_input_files(m, n, blocked_probability):
     input_file_name_up_down = 'pathfinding_a.txt'
     input_file_name_diagonal = 'pathfinding_b.txt'
-    empty_string = ''
 
     maze = create_maze(m, n, blocked_probability)
-    append_line_to_file(empty_string, input_file_name_up_down)
-    write_to_file(maze, input_file_name_up_down)
-    append_line_to_file(empty_string, input_file_name_diagonal)
-    write_to_file(maze, input_file_name_diagonal)
+    for input_file_name in (input_file_name_up_down, input_file_name_diagonal):
+        with open(input_file_name, 'a') as file:
+            file.write('\n')
+            write_maze(maze, file)
 
 
 def clear_content_of_file(file_name):
@@ -92,6 +74,8 @@ def main():
     write_new_maze_to_input_files(num_row, num_col, blocked_probability)
 
 
-main()
-# the following line when not commented will run the pathfinding.py
+if __name__ == '__main__':
+    main()
+# the following lines when not commented will run the pathfinding.py
 # import pathfinding
+# pathfinding.main()
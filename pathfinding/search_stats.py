@@ -0,0 +1,108 @@
+import time
+
+
+class SearchStats:
+    """
+    Collects counters and timings of one search. Every search method of PathFinding takes an optional stats
+    argument; when it is None the search does no extra work beyond one test per expansion and per push.
+    The hooks on_expand(state) and on_push(state, priority) are called on every expansion and push, so a tracer or
+    a sampling profiler can be attached to a search without changing it.
+    """
+
+    def __init__(self, on_expand=None, on_push=None):
+        self.on_expand = on_expand
+        self.on_push = on_push
+        self.nodes_expanded = 0
+        self.stale_pops = 0  # entries popped for a state that had already been reached more cheaply or expanded
+        self.pushes = 0
+        self.max_frontier = 0
+        self.neighbour_calls = 0
+        self.neighbour_time = 0.0
+        self.heuristic_calls = 0
+        self.heuristic_time = 0.0
+        self.start_time = None
+        self.search_time = 0.0
+
+    def start(self):
+        """
+        Marks the start of the search.
+        """
+        self.start_time = time.perf_counter()
+
+    def stop(self):
+        """
+        Marks the end of the search.
+        """
+        if self.start_time is not None:
+            self.search_time += time.perf_counter() - self.start_time
+            self.start_time = None
+
+    def expand(self, state):
+        """
+        Counts the expansion of a state popped from the frontier.
+        :param state: the state being expanded
+        """
+        self.nodes_expanded += 1
+        if self.on_expand is not None:
+            self.on_expand(state)
+
+    def stale_pop(self):
+        """
+        Counts an entry popped from the frontier and skipped without expanding its state.
+        """
+        self.stale_pops += 1
+
+    def push(self, state, priority, frontier_size):
+        """
+        Counts a push to the frontier.
+        :param state: the state pushed
+        :param priority: the priority of the state
+        :param frontier_size: the size of the frontier after the push
+        """
+        self.pushes += 1
+        if frontier_size > self.max_frontier:
+            self.max_frontier = frontier_size
+        if self.on_push is not None:
+            self.on_push(state, priority)
+
+    def timed_neighbours(self, get_open_neighbours):
+        """
+        :param get_open_neighbours: a function that generates neighbours, such as one from a state to its open
+                                    neighbours
+        :return: a function that does the same and adds its calls and time to the stats
+        """
+        def timed(*args):
+            start_time = time.perf_counter()
+            neighbours = get_open_neighbours(*args)
+            self.neighbour_time += time.perf_counter() - start_time
+            self.neighbour_calls += 1
+            return neighbours
+        return timed
+
+    def timed_heuristic(self, heuristic):
+        """
+        :param heuristic: a heuristic function, such as one from a state to its heuristic value
+        :return: a function that does the same and adds its calls and time to the stats
+        """
+        def timed(*args):
+            start_time = time.perf_counter()
+            value = heuristic(*args)
+            self.heuristic_time += time.perf_counter() - start_time
+            self.heuristic_calls += 1
+            return value
+        return timed
+
+    def record(self):
+        """
+        :return: the counters and timings as a dictionary
+        """
+        return {'nodes_expanded': self.nodes_expanded,
+                'stale_pops': self.stale_pops,
+                'pushes': self.pushes,
+                'pops': self.nodes_expanded + self.stale_pops,
+                'max_frontier': self.max_frontier,
+                'neighbour_calls': self.neighbour_calls,
+                'neighbour_time': self.neighbour_time,
+                'heuristic_calls': self.heuristic_calls,
+                'heuristic_time': self.heuristic_time,
+                'search_time': self.search_time}
@@ -0,0 +1,330 @@
+import argparse
+import asyncio
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+import sys
+import time
+
+from binary_maze import BinaryMazeFile
+from pathfinding import PathFinding, iter_mazes
+
+ALGORITHMS = ('greedy', 'a_star', 'bidirectional_a_star', 'jump_point', 'hierarchical', 'landmark_a_star',
+              'anytime_a_star')
+MOVEMENTS = ('up_down', 'diagonal')
+
+# the mazes loaded by a worker process, a map from a maze name to a list of FlatGrids or to a BinaryMazeFile
+worker_mazes = dict()
+# the FlatGrids of the mazes of binary maze files used by the queries of a worker, a map from (name, index)
+worker_grids = dict()
+# the component labels of every maze in a worker, so that queries with no path are answered without searching
+worker_labels = dict()
+
+
+def load_mazes(sources):
+    """
+    Loads the mazes of the server into a worker process, once when the worker starts.
+    Binary maze files are memory-mapped, so all workers share one copy of their pages.
+    The content hash of every text maze is computed here, so that the caches of the searches find the maze without
+    hashing its cells again for every query.
+    :param sources: a list of (maze name, file name)
+    """
+    for name, file_name in sources:
+        if file_name.endswith('.pfm'):
+            worker_mazes[name] = BinaryMazeFile(file_name)
+        else:
+            grids = [PathFinding(maze).get_flat_grid() for maze in iter_mazes(file_name)]
+            for grid in grids:
+                grid.content_hash()
+            worker_mazes[name] = grids
+
+
+def get_grid(name, index):
+    """
+    :param name: the name of a maze file loaded by load_mazes
+    :param index: the position of the maze in the file
+    :return: the FlatGrid of the maze, with its content hash computed
+    """
+    if name not in worker_mazes:
+        raise ValueError('unknown maze {}'.format(name))
+    mazes = worker_mazes[name]
+    if not 0 <= index < len(mazes):
+        raise ValueError('maze {} has no maze number {}'.format(name, index))
+    if isinstance(mazes, BinaryMazeFile):
+        # a binary maze file can hold many mazes, so the grid of a maze is made and hashed when a query first uses it
+        grid = worker_grids.get((name, index))
+        if grid is None:
+            grid = mazes.get_flat_grid(index)
+            grid.content_hash()
+            worker_grids[(name, index)] = grid
+        return grid
+    return mazes[index]
+
+
+def get_state(grid, value, default_index, role):
+    """
+    Reads a start or goal state of a query and checks that it is an open cell of the maze.
+    :return: the state as a tuple (x, y)
+    """
+    if value is None:
+        if default_index is None:
+            raise ValueError('the maze has no {} state, so the query must give one'.format(role))
+        return grid.state(default_index)
+    state = tuple(value)
+    if len(state) != 2 or not (0 <= state[0] < grid.num_rows and 0 <= state[1] < grid.num_cols):
+        raise ValueError('the {} state {} is not in the maze'.format(role, list(value)))
+    if not grid.cells[grid.index(state)]:
+        raise ValueError('the {} state {} is blocked'.format(role, list(value)))
+    return state
+
+
+def solve_query(query):
+    """
+    Answers one path query in a worker process.
+    :param query: a dictionary with the keys maze, and optionally index, start, goal, algorithm, movement, timeout
+                  and, for anytime_a_star, budget, the number of seconds it may search for, which is at most the
+                  timeout so that the search stops in the worker instead of running on after the query timed out
+    :return: a dictionary with the path as a list of [x, y] and its cost, or a path of None if there is no path
+    """
+    name = query['maze']
+    index = query.get('index', 0)
+    grid = get_grid(name, index)
+    start = get_state(grid, query.get('start'), grid.start_index, 'start')
+    goal = get_state(grid, query.get('goal'), grid.goal_index, 'goal')
+    algorithm = query.get('algorithm', 'a_star')
+    movement = query.get('movement', 'up_down')
+    if algorithm not in ALGORITHMS:
+        raise ValueError('unknown algorithm {}, expected one of {}'.format(algorithm, ALGORITHMS))
+    if movement not in MOVEMENTS:
+        raise ValueError('unknown movement {}, expected one of {}'.format(movement, MOVEMENTS))
+
+    path_finding = PathFinding.from_flat_grid(grid.with_endpoints(start, goal))
+    # the labels only depend on the cells, so they are shared by all queries on the maze
+    path_finding.component_labels = worker_labels.setdefault((name, index), dict())
+    path_finding.label_components(movement == 'diagonal')
+    search = getattr(path_finding, algorithm + '_search_' + movement)
+    answer = dict()
+    if algorithm == 'anytime_a_star':
+        budget = query.get('budget')
+        if query.get('timeout') is not None:
+            budget = query['timeout'] if budget is None else min(budget, query['timeout'])
+        path_map, bound = None, None
+        for path_map, bound in search(time_budget=budget):
+            pass
+        answer['bound'] = bound
+    else:
+        path_map = search()
+    path = path_finding.get_path(path_map)
+    answer['path'] = [list(state) for state in path.states()] if path is not None else None
+    answer['cost'] = path.cost if path is not None else None
+    return answer
+
+
+def percentile(sorted_values, fraction):
+    """
+    :param sorted_values: a non-empty sorted list
+    :param fraction: a number between 0 and 1
+    :return: the nearest-rank percentile of the values
+    """
+    rank = max(0, min(len(sorted_values) - 1, int(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[rank]
+
+
+class PathServer:
+    """
+    Answers JSON-lines queries on preloaded mazes. Every line is a JSON object, either a path query such as
+        {"id": 1, "maze": "a", "index": 0, "start": [1, 1], "goal": [5, 7], "algorithm": "a_star",
+         "movement": "diagonal", "timeout": 2}
+    or a command, {"command": "stats"} or {"command": "mazes"}. Every answer is one JSON line with the id of its
+    query. Queries are answered concurrently by a pool of worker processes, so answers can come in any order.
+    At most max_pending queries are in flight; while that many are running no more lines are read, which pushes
+    back on the client through the socket or pipe.
+    """
+
+    def __init__(self, sources, workers=None, max_pending=64, timeout=10.0, latency_window=10000):
+        self.sources = sources
+        self.executor = ProcessPoolExecutor(workers or os.cpu_count() or 1, initializer=load_mazes,
+                                            initargs=(sources,))
+        self.pending = asyncio.Semaphore(max_pending)
+        self.timeout = timeout
+        self.latencies = deque(maxlen=latency_window)  # the latencies of the latest answered queries
+        self.counts = {'queries': 0, 'answered': 0, 'errors': 0, 'timeouts': 0}
+        self.in_flight = 0
+        self.timed_out_running = 0  # searches that timed out but are still running in a worker
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+
+    def get_stats(self):
+        """
+        :return: the counters of the server and the percentiles of the latencies in seconds of the latest queries
+        """
+        stats = dict(self.counts)
+        stats['in_flight'] = self.in_flight
+        stats['timed_out_running'] = self.timed_out_running
+        latencies = sorted(self.latencies)
+        if latencies:
+            stats['latency'] = {'p50': percentile(latencies, 0.5), 'p90': percentile(latencies, 0.9),
+                                'p99': percentile(latencies, 0.99), 'max': latencies[-1],
+                                'samples': len(latencies)}
+        return stats
+
+    async def answer_query(self, query):
+        """
+        Runs a query in the worker pool and measures its latency.
+        :return: a pair (the answer as a dictionary, the concurrent.futures.Future of the search if it timed out and
+                 is still running in a worker, otherwise None)
+        """
+        self.counts['queries'] += 1
+        self.in_flight += 1
+        start_time = time.perf_counter()
+        query = dict(query, timeout=query.get('timeout', self.timeout))
+        worker = self.executor.submit(solve_query, query)
+        running = None
+        try:
+            answer = await asyncio.wait_for(asyncio.wrap_future(worker), query['timeout'])
+            self.counts['answered'] += 1
+        except asyncio.TimeoutError:
+            # a search that has not started is cancelled, but a running worker cannot be interrupted
+            self.counts['timeouts'] += 1
+            answer = {'error': 'timed out'}
+            if not worker.cancel():
+                running = worker
+        except Exception as error:
+            # a bad query must not take the server down, so every error of a search is sent back to the client
+            self.counts['errors'] += 1
+            answer = {'error': '{}: {}'.format(type(error).__name__, error)}
+        finally:
+            self.in_flight -= 1
+        latency = time.perf_counter() - start_time
+        self.latencies.append(latency)
+        answer['elapsed'] = latency
+        return answer, running
+
+    async def handle_line(self, line, write_line):
+        """
+        Answers one line of a client and releases its place among the pending queries.
+        :param line: the line as bytes
+        :param write_line: a coroutine function that sends a dictionary to the client as a JSON line
+        """
+        running = None
+        try:
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError('a request must be a JSON object')
+            except ValueError as error:
+                self.counts['errors'] += 1
+                await write_line({'error': 'invalid request: {}'.format(error)})
+                return
+            command = request.get('command')
+            if command == 'stats':
+                answer = self.get_stats()
+            elif command == 'mazes':
+                answer = {'mazes': {name: file_name for name, file_name in self.sources}}
+            elif command is not None:
+                self.counts['errors'] += 1
+                answer = {'error': 'unknown command {}'.format(command)}
+            else:
+                answer, running = await self.answer_query(request)
+            if 'id' in request:
+                answer['id'] = request['id']
+            await write_line(answer)
+        finally:
+            if running is not None:
+                # the client has its answer, but the place is kept until the worker is free again, so that searches
+                # that timed out cannot pile up in the workers beyond max_pending
+                self.timed_out_running += 1
+                await asyncio.wait([asyncio.wrap_future(running)])
+                self.timed_out_running -= 1
+            self.pending.release()
+
+    async def serve(self, read_line, write_line):
+        """
+        Reads the lines of one client until it closes its side and answers them.
+        :param read_line: a coroutine function that reads the next line from the client, b'' at the end
+        :param write_line: a coroutine function that sends a dictionary to the client as a JSON line
+        """
+        tasks = set()
+        while True:
+            await self.pending.acquire()
+            line = await read_line()
+            if not line:
+                self.pending.release()
+                break
+            if not line.strip():
+                self.pending.release()
+                continue
+            task = asyncio.ensure_future(self.handle_line(line, write_line))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.wait(tasks)
+
+    async def serve_unix_client(self, reader, writer):
+        async def write_line(answer):
+            writer.write(json.dumps(answer).encode() + b'\n')
+            await writer.drain()
+
+        try:
+            await self.serve(reader.readline, write_line)
+        finally:
+            writer.close()
+
+    async def serve_unix_socket(self, path):
+        server = await asyncio.start_unix_server(self.serve_unix_client, path)
+        async with server:
+            await server.serve_forever()
+
+    async def serve_stdio(self):
+        loop = asyncio.get_running_loop()
+
+        async def read_line():
+            # stdin can be a file, which asyncio cannot read without blocking, so it is read in a thread
+            return await loop.run_in_executor(None, sys.stdin.buffer.readline)
+
+        async def write_line(answer):
+            sys.stdout.write(json.dumps(answer) + '\n')
+            sys.stdout.flush()
+
+        await self.serve(read_line, write_line)
+
+
+def parse_source(text):
+    name, separator, file_name = text.partition('=')
+    if not separator or not name or not file_name:
+        raise argparse.ArgumentTypeError('expected NAME=FILE, got {}'.format(text))
+    return name, file_name
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Answer path queries on preloaded mazes as JSON lines.')
+    parser.add_argument('--maze', dest='sources', action='append', type=parse_source, default=[],
+                        help='load the mazes of FILE, a text maze file or a .pfm binary maze file, as NAME')
+    parser.add_argument('--socket', help='listen on this Unix socket instead of stdin and stdout')
+    parser.add_argument('--workers', type=int, default=None, help='the number of worker processes')
+    parser.add_argument('--max-pending', type=int, default=64, help='the number of queries in flight at most')
+    parser.add_argument('--timeout', type=float, default=10.0, help='the default timeout of a query in seconds')
+    arguments = parser.parse_args()
+    if not arguments.sources:
+        arguments.sources = [('a', 'pathfinding_a.txt'), ('b', 'pathfinding_b.txt')]
+
+    async def run():
+        server = PathServer(arguments.sources, arguments.workers, arguments.max_pending, arguments.timeout)
+        try:
+            if arguments.socket:
+                await server.serve_unix_socket(arguments.socket)
+            else:
+                await server.serve_stdio()
+        finally:
+            server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()